@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
 import gzip
 import re
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
-import httpx
+from httpstack import HTTPStack
+
+network = HTTPStack()
 
 epg_file = Path(__file__).parent / "TV.xml"
 epg_urls = [
@@ -20,14 +23,7 @@ epg_urls = [
     "https://i.mjh.nz/Roku/all.xml.gz",
 ]
 
-client = httpx.AsyncClient(
-    timeout=5,
-    follow_redirects=True,
-    http2=True,
-    headers={
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36 Edg/134.0.0.0"
-    },
-)
+client = network.client
 
 live_img = "https://i.gyazo.com/978f2eb4a199ca5b56b447aded0cb9e3.png"
 
@@ -73,7 +69,7 @@ def get_tvg_ids() -> dict[str, str]:
 
 async def fetch_xml(url: str) -> ET.Element | None:
     try:
-        r = await client.get(url)
+        r = await client.get(url, extensions={"host_class": "archive"})
         r.raise_for_status()
     except Exception as e:
         print(f'Failed to fetch "{url}": {e}')
@@ -137,7 +133,9 @@ def hijack_id(
 
 
 async def main() -> None:
-    tvg_ids = get_tvg_ids()
+    prewarm = asyncio.create_task(network.prewarm(epg_urls))
+
+    tvg_ids = await asyncio.to_thread(get_tvg_ids)
 
     tvg_ids |= dummies | {v["old"]: live_img for v in replace_ids.values()}
 
@@ -147,6 +145,10 @@ async def main() -> None:
 
     results = await asyncio.gather(*tasks)
 
+    prewarm.cancel()
+
+    await asyncio.gather(prewarm, return_exceptions=True)
+
     for epg_data in results:
         if epg_data is None:
             continue
@@ -184,8 +186,23 @@ async def main() -> None:
 
     print(f"EPG saved to {epg_file.resolve()}")
 
+    network.timer.log_summary()
+
+    network.timer.save()
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        metavar="FILE",
+        help="write per-request and per-host HTTP timings to FILE as JSON",
+    )
+
+    network.timer.file = parser.parse_args().timings
+
     asyncio.run(main())
 
     try:
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
+import argparse
 import asyncio
+import hashlib
 import re
 from pathlib import Path
+from types import ModuleType
 
 from scrapers import (
     fstv,
@@ -16,7 +19,24 @@ from scrapers import (
     tvpass,
     watchfooty,
 )
-from scrapers.utils import get_logger, network
+from scrapers.utils import (
+    History,
+    Scheduler,
+    Time,
+    WorkQueue,
+    browsers,
+    drain,
+    get_logger,
+    network,
+    reduce_shards,
+    relay,
+    resolver,
+    run_shards,
+    server,
+    snapshot,
+    tracked_scrape,
+    work,
+)
 
 log = get_logger(__name__)
 
@@ -26,51 +46,139 @@ EVENTS_FILE = Path(__file__).parent / "events.m3u8"
 
 COMBINED_FILE = Path(__file__).parent / "TV.m3u8"
 
+EPG_FILE = Path(__file__).parent.parent / "EPG" / "TV.xml"
+
+M3U8_TYPE = "application/vnd.apple.mpegurl"
+
+HISTORY = History(Path(__file__).parent / "scrapers" / "caches" / "history.json")
+
+SCRAPERS = [
+    fstv,
+    lotus,
+    pixel,
+    ppv,
+    roxie,
+    streambtw,
+    streameast,
+    strmd,
+    strmfree,
+    tvpass,
+    watchfooty,
+]
+
+SCHEDULE = Scheduler(
+    Path(__file__).parent / "scrapers" / "caches" / "schedule.json",
+    window=min(mod.WINDOW for mod in SCRAPERS if hasattr(mod, "event_times")),
+)
+
 
 def load_base() -> tuple[list[str], int]:
     log.info("Fetching base M3U8")
 
     data = BASE_FILE.read_text(encoding="utf-8")
 
-    pattern = re.compile(r'tvg-chno="(\d+)"')
+    digest = hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+    if (index := snapshot.meta.get("base", {})).get("hash") == digest:
+        last_chnl_num = index["chno"]
+    else:
+        pattern = re.compile(r'tvg-chno="(\d+)"')
 
-    last_chnl_num = max(map(int, pattern.findall(data)), default=0)
+        last_chnl_num = max(map(int, pattern.findall(data)), default=0)
+
+        snapshot.meta["base"] = {"hash": digest, "chno": last_chnl_num}
 
     return data.splitlines(), last_chnl_num
 
 
-async def main() -> None:
-    base_m3u8, tvg_chno = load_base()
-
-    tasks = [
-        asyncio.create_task(fstv.scrape(network.client)),
-        asyncio.create_task(lotus.scrape(network.client)),
-        asyncio.create_task(pixel.scrape(network.client)),
-        asyncio.create_task(ppv.scrape(network.client)),
-        asyncio.create_task(roxie.scrape(network.client)),
-        asyncio.create_task(streambtw.scrape(network.client)),
-        asyncio.create_task(streameast.scrape(network.client)),
-        asyncio.create_task(strmd.scrape(network.client)),
-        asyncio.create_task(strmfree.scrape(network.client)),
-        asyncio.create_task(tvpass.scrape(network.client)),
-        asyncio.create_task(watchfooty.scrape(network.client)),
-    ]
-
-    await asyncio.gather(*tasks)
-
-    additions = (
-        fstv.urls
-        | lotus.urls
-        | pixel.urls
-        | ppv.urls
-        | roxie.urls
-        | streambtw.urls
-        | streameast.urls
-        | strmd.urls
-        | strmfree.urls
-        | tvpass.urls
-        | watchfooty.urls
-    )
+def event_times() -> list[float]:
+    times: list[float] = []
+
+    for mod in SCRAPERS:
+        if not hasattr(mod, "event_times"):
+            continue
+
+        try:
+            times.extend(mod.event_times())
+        except Exception as e:
+            log.warning(f"Failed to read event times from {mod.__name__}: {e}")
+
+    return times
+
+
+def provider_urls() -> list[str]:
+    urls: list[str] = []
+
+    for mod in SCRAPERS:
+        if not HISTORY.should_run(mod.__name__):
+            continue
+
+        urls.extend(getattr(mod, "MIRRORS", []))
+
+        urls.extend(
+            url for name in ("BASE_URL", "API_URL") if (url := getattr(mod, name, None))
+        )
+
+    return urls
+
+
+def cached_events(mod: ModuleType) -> dict[str, dict]:
+    return {k: v for k, v in mod.CACHE_FILE.load().items() if v["url"]}
+
+
+async def scrape(workers: int = 1, timeout: int | float = 600) -> None:
+    active: list[ModuleType] = []
+
+    for mod in SCRAPERS:
+        mod.urls.clear()
+
+        if HISTORY.should_run(mod.__name__):
+            active.append(mod)
+            continue
+
+        due = Time.from_ts(HISTORY.next_due(mod.__name__))
+
+        log.info(f"Backing off {mod.__name__} until {due:%H:%M}, using cached events")
+
+        mod.urls.update(cached_events(mod))
+
+    if workers <= 1:
+        stats = await asyncio.gather(*(tracked_scrape(mod) for mod in active))
+
+        results = {
+            mod.__name__: {"urls": mod.urls, "stats": mod_stats}
+            for mod, mod_stats in zip(active, stats)
+        }
+
+    else:
+        groups = [active[i::workers] for i in range(workers)]
+
+        results = await asyncio.to_thread(
+            run_shards,
+            [[mod.__name__ for mod in group] for group in groups if group],
+            timeout,
+        )
+
+    for mod in active:
+        if (shard := results.get(mod.__name__)) is None:
+            log.warning(f"No results from {mod.__name__}, using cached events")
+
+            mod.urls.update(cached_events(mod))
+
+            continue
+
+        mod.urls.update(shard["urls"])
+
+        HISTORY.record(mod.__name__, shard["stats"])
+
+    HISTORY.save()
+
+
+def write_playlists(
+    additions: dict[str, dict],
+    base_m3u8: list[str],
+    tvg_chno: int,
+) -> None:
 
     live_events: list[str] = []
 
@@ -80,6 +188,9 @@ async def main() -> None:
         sorted(additions.items()),
         start=1,
     ):
+        if relay.enabled:
+            info = relay.add(event, info)
+
         extinf_all = (
             f'#EXTINF:-1 tvg-chno="{tvg_chno + i}" tvg-id="{info["id"]}" '
             f'tvg-name="{event}" tvg-logo="{info["logo"]}" group-title="Live Events",{event}'
@@ -101,24 +212,264 @@ async def main() -> None:
 
         live_events.extend(["\n" + extinf_live, *vlc_block])
 
-    COMBINED_FILE.write_text(
-        "\n".join(base_m3u8 + combined_channels),
-        encoding="utf-8",
-    )
+    combined = "\n".join(base_m3u8 + combined_channels)
+
+    COMBINED_FILE.write_text(combined, encoding="utf-8")
 
     log.info(f"Base + Events saved to {COMBINED_FILE.resolve()}")
 
-    EVENTS_FILE.write_text(
+    events = (
         '#EXTM3U url-tvg="https://github.com/BuddyChewChew/iptv/raw/refs/heads/main/EPG/TV.xml"\n'
-        + "\n".join(live_events),
-        encoding="utf-8",
+        + "\n".join(live_events)
     )
 
+    EVENTS_FILE.write_text(events, encoding="utf-8")
+
     log.info(f"Events saved to {EVENTS_FILE.resolve()}")
 
+    server.publish(f"/{COMBINED_FILE.name}", combined, M3U8_TYPE)
+
+    server.publish(f"/{EVENTS_FILE.name}", events, M3U8_TYPE)
+
+
+async def main(workers: int = 1, timeout: int | float = 600) -> None:
+    started = Time.now().timestamp()
+
+    prewarm = asyncio.create_task(
+        network.prewarm(provider_urls() if workers <= 1 else [])
+    )
+
+    base_m3u8, tvg_chno = await asyncio.to_thread(load_base)
+
+    await scrape(workers, timeout)
+
+    prewarm.cancel()
+
+    await asyncio.gather(prewarm, return_exceptions=True)
+
+    network.log_summary()
+
+    network.mirrors.save()
+
+    network.latency.save()
+
+    network.timer.save()
+
+    if not resolver.enabled:
+        await browsers.close()
+
+    additions = {k: v for mod in SCRAPERS for k, v in mod.urls.items()}
+
+    write_playlists(additions, base_m3u8, tvg_chno)
+
+    SCHEDULE.mark(started)
+
+    snapshot.save(base=snapshot.meta.get("base"))
+
+
+async def watch(workers: int = 1, timeout: int | float = 600) -> None:
+    while True:
+        await main(workers, timeout)
+
+        run_at, batch = SCHEDULE.next_run(event_times())
+
+        if batch:
+            log.info(
+                f"Next run at {Time.from_ts(run_at):%H:%M} for {len(batch)} event(s) "
+                f"starting from {Time.from_ts(batch[0]):%H:%M}"
+            )
+        else:
+            log.info(f"Next run at {Time.from_ts(run_at):%H:%M}")
+
+        await asyncio.sleep(max(run_at - Time.now().timestamp(), 0) + 1)
+
+
+async def serve(
+    host: str,
+    port: int,
+    workers: int = 1,
+    timeout: int | float = 600,
+) -> None:
+
+    for file in (COMBINED_FILE, EVENTS_FILE):
+        await server.publish_file(f"/{file.name}", file, M3U8_TYPE)
+
+    if resolver.enabled:
+        server.route(resolver.PREFIX, resolver.handle)
+
+    if relay.enabled:
+        server.route(relay.PREFIX, relay.handle)
+
+    await server.start(host, port)
+
+    epg_task = asyncio.create_task(
+        server.watch_file(f"/{EPG_FILE.name}", EPG_FILE, "application/xml")
+    )
+
+    try:
+        await watch(workers, timeout)
+    finally:
+        epg_task.cancel()
+
+        await server.close()
+
+        await resolver.close()
+
+        await browsers.close()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and scrape shortly before upcoming events start",
+    )
+
+    parser.add_argument(
+        "--if-due",
+        type=int,
+        metavar="SECS",
+        help="only scrape if a run is due within SECS seconds",
+    )
+
+    parser.add_argument(
+        "--serve",
+        metavar="HOST:PORT",
+        help="serve playlists and EPG over HTTP (implies --watch)",
+    )
+
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="resolve browser-extracted streams on first play (requires --serve)",
+    )
+
+    parser.add_argument(
+        "--relay",
+        action="store_true",
+        help="proxy streams through a shared HLS relay (requires --serve)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="split scrapers across N worker processes",
+    )
+
+    parser.add_argument(
+        "--worker-timeout",
+        type=int,
+        default=600,
+        metavar="SECS",
+        help="kill a worker process (and its browsers) after SECS seconds",
+    )
+
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        metavar="DB",
+        help="shared SQLite work queue for split runs",
+    )
+
+    parser.add_argument(
+        "--split",
+        choices=["enqueue", "work", "reduce"],
+        help="split-run role: queue providers, claim work items, or merge shards",
+    )
+
+    parser.add_argument(
+        "--no-backoff",
+        action="store_true",
+        help="run every provider regardless of its recent yield",
+    )
+
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        metavar="FILE",
+        help="restore caches from FILE at startup and save them back after each run",
+    )
+
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        metavar="FILE",
+        help="write per-request and per-host HTTP timings to FILE as JSON",
+    )
+
+    parser.add_argument(
+        "--public-url",
+        metavar="URL",
+        help="base URL clients use to reach the server",
+    )
+
+    args = parser.parse_args()
+
+    snapshot.file = args.snapshot
+
+    network.timer.file = args.timings
+
+    if snapshot.file:
+        snapshot.restore()
+
+        HISTORY.load()
+
+        network.mirrors.load()
+
+        network.latency.load()
+
+    HISTORY.enabled = not args.no_backoff
+
+    if args.if_due is not None and not SCHEDULE.is_due(event_times(), args.if_due):
+        log.info("No events due, skipping run")
+        raise SystemExit
+
+    if (args.lazy or args.relay) and not args.serve:
+        parser.error("--lazy and --relay require --serve")
+
+    if args.lazy and args.workers > 1:
+        parser.error("--lazy can't be combined with --workers")
+
+    if bool(args.split) != bool(args.queue):
+        parser.error("--split and --queue must be used together")
+
+    if args.split:
+        queue = WorkQueue(args.queue)
+
+        if args.split == "enqueue":
+            run = queue.start_run([mod.__name__ for mod in SCRAPERS])
+            log.info(f"Queued {len(SCRAPERS)} provider(s) for run {run}")
+
+        elif args.split == "work":
+            asyncio.run(work(queue))
+
+        elif run := queue.latest_run():
+            asyncio.run(drain(queue, run, args.worker_timeout))
+
+            write_playlists(reduce_shards(queue.shard_dir(run)), *load_base())
+
+    elif args.serve:
+        host, _, port = args.serve.rpartition(":")
+
+        public_url = args.public_url or f"http://{host or '127.0.0.1'}:{port}"
+
+        resolver.enabled, resolver.base_url = args.lazy, public_url.rstrip("/")
+
+        relay.enabled, relay.base_url = args.relay, public_url.rstrip("/")
+
+        asyncio.run(
+            serve(host or "0.0.0.0", int(port), args.workers, args.worker_timeout)
+        )
+
+    elif args.watch:
+        asyncio.run(watch(args.workers, args.worker_timeout))
+
+    else:
+        asyncio.run(main(args.workers, args.worker_timeout))
 
     try:
         asyncio.run(network.client.aclose())
@@ -5,7 +5,7 @@ from urllib.parse import unquote, urljoin
 import httpx
 from selectolax.parser import HTMLParser
 
-from .utils import Cache, Time, get_logger, leagues, network
+from .utils import Cache, Time, get_logger, leagues, network, offload
 
 log = get_logger(__name__)
 
@@ -28,14 +28,14 @@ async def process_event(
 ) -> tuple[str, str]:
 
     try:
-        r = await client.get(url)
+        r = await client.get(url, extensions={"host_class": "page"})
         r.raise_for_status()
     except Exception as e:
         log.error(f'URL {url_num}) Failed to fetch "{url}": {e}')
 
         return "", ""
 
-    soup = HTMLParser(r.text)
+    soup = await offload.html(r.text)
 
     if category_links := soup.css(".common-list-category .category-item a"):
         match_name = category_links[-1].text(strip=True)
@@ -57,21 +57,13 @@ async def process_event(
         return match_name or "", unquote(src).split("link=")[-1]
 
 
-async def get_events(
-    client: httpx.AsyncClient,
+def parse_events(
+    html: str,
     base_url: str,
     cached_hrefs: set[str],
 ) -> list[dict[str, str]]:
 
-    try:
-        r = await client.get(base_url)
-        r.raise_for_status()
-    except Exception as e:
-        log.error(f'Failed to fetch "{base_url}": {e}')
-
-        return []
-
-    soup = HTMLParser(r.text)
+    soup = HTMLParser(html)
 
     events = []
 
@@ -111,17 +103,43 @@ async def get_events(
     return events
 
 
+async def get_events(
+    client: httpx.AsyncClient,
+    base_url: str,
+    cached_hrefs: set[str],
+) -> list[dict[str, str]]:
+
+    if not (html := network.probed_body(base_url)):
+        try:
+            r = await client.get(base_url, extensions={"host_class": "page"})
+            r.raise_for_status()
+        except Exception as e:
+            log.error(f'Failed to fetch "{base_url}": {e}')
+
+            return []
+
+        html = r.text
+
+    return await offload.run(
+        parse_events,
+        html,
+        base_url,
+        cached_hrefs,
+        size=len(html),
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
     cached_hrefs = {entry["href"] for entry in cached_urls.values()}
     cached_count = len(cached_urls)
     urls.update(cached_urls)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
-    if not (base_url := await network.get_base(MIRRORS)):
+    if not (base_url := await network.get_base(MIRRORS, keep_body=True)):
         log.warning("No working FSTV mirrors")
-        CACHE_FILE.write(cached_urls)
+        await CACHE_FILE.awrite(cached_urls)
         return
 
     log.info(f'Scraping from "{base_url}"')
@@ -178,4 +196,4 @@ async def scrape(client: httpx.AsyncClient) -> None:
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
@@ -1,10 +1,19 @@
 from functools import partial
 from pathlib import Path
+from typing import Any
 
 import httpx
-from playwright.async_api import async_playwright
 
-from .utils import Cache, Time, get_logger, leagues, network
+from .utils import (
+    Cache,
+    Time,
+    browsers,
+    get_logger,
+    leagues,
+    network,
+    offload,
+    resolver,
+)
 
 log = get_logger(__name__)
 
@@ -12,7 +21,9 @@ urls: dict[str, dict[str, str | float]] = {}
 
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "lotus.json", exp=3_600)
 
-API_CACHE = Cache(Path(__file__).parent / "caches" / "lotus_api.json", exp=28_800)
+PAGE_WORKERS = 3
+
+API_TTL = 28_800
 
 BASE_URL = "https://lotusgamehd.xyz/api-event.php"
 
@@ -21,25 +32,19 @@ def fix_league(s: str) -> str:
     return " ".join(x.capitalize() for x in s.split()) if len(s) > 5 else s.upper()
 
 
-async def refresh_api_cache(
+async def get_api_data(
     client: httpx.AsyncClient,
     url: str,
-    ts: float,
 ) -> dict[str, dict[str, str]]:
-    log.info("Refreshing API cache")
 
     try:
-        r = await client.get(url)
+        r = await client.get(url, extensions={"cache": API_TTL, "host_class": "api"})
         r.raise_for_status()
     except Exception as e:
         log.error(f'Failed to fetch "{url}": {e}')
         return {}
 
-    data = r.json()
-
-    data["timestamp"] = ts
-
-    return data
+    return await offload.json(r.content)
 
 
 async def get_events(
@@ -49,14 +54,7 @@ async def get_events(
 ) -> list[dict[str, str]]:
     now = Time.clean(Time.now())
 
-    if not (api_data := API_CACHE.load(per_entry=False)):
-        api_data = await refresh_api_cache(
-            client,
-            event_link,
-            now.timestamp(),
-        )
-
-        API_CACHE.write(api_data)
+    api_data = await get_api_data(client, event_link)
 
     events: list[dict[str, str]] = []
 
@@ -96,10 +94,26 @@ async def get_events(
     return events
 
 
+def defer(key: str, entry: dict[str, Any], url_num: int) -> dict[str, Any]:
+    return resolver.add(
+        key,
+        entry,
+        partial(
+            network.process_event,
+            url=entry["link"],
+            url_num=url_num,
+            log=log,
+        ),
+        browser="brave",
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
+    deferred = resolver.restore(cached_urls, defer)
     cached_count = len(cached_urls)
     urls.update(cached_urls)
+    urls.update(deferred)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
@@ -113,27 +127,43 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Processing {len(events)} new URL(s)")
 
-    if events:
+    if events and resolver.enabled:
         now = Time.now().timestamp()
 
-        async with async_playwright() as p:
-            browser, context = await network.browser(p, browser="brave")
+        for i, ev in enumerate(events, start=1):
+            sport, event = ev["sport"], ev["event"]
+
+            tvg_id, logo = leagues.get_tvg_info(sport, event)
 
-            for i, ev in enumerate(events, start=1):
-                handler = partial(
-                    network.process_event,
-                    url=ev["link"],
-                    url_num=i,
-                    context=context,
-                    log=log,
-                )
+            key = f"[{sport}] {event} (LOTUS)"
 
-                url = await network.safe_process(
-                    handler,
-                    url_num=i,
-                    log=log,
-                )
+            entry = {
+                "logo": logo,
+                "base": "https://vividmosaica.com/",
+                "timestamp": now,
+                "id": tvg_id or "Live.Event.us",
+                "link": ev["link"],
+            }
 
+            urls[key] = defer(key, entry, i)
+
+            cached_urls[key] = resolver.placeholder(entry)
+
+        log.info(f"Deferred {len(events)} event(s) for on-demand resolution")
+
+    elif events:
+        now = Time.now().timestamp()
+
+        async with browsers.lease(browser="brave") as lease:
+            results = await network.extract(
+                events,
+                partial(network.process_event, log=log),
+                lease.context,
+                log=log,
+                workers=PAGE_WORKERS,
+            )
+
+            for ev, url in zip(events, results):
                 if url:
                     sport, event = ev["sport"], ev["event"]
 
@@ -151,11 +181,9 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
                     urls[key] = cached_urls[key] = entry
 
-            await browser.close()
-
     if new_count := len(cached_urls) - cached_count:
         log.info(f"Collected and cached {new_count} new event(s)")
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
@@ -3,38 +3,44 @@ from pathlib import Path
 
 import httpx
 
-from .utils import Cache, Time, get_logger, leagues
+from .utils import Cache, Time, get_logger, leagues, network, offload
 
 log = get_logger(__name__)
 
 urls: dict[str, dict[str, str | float]] = {}
 
-API_FILE = Cache(Path(__file__).parent / "caches" / "pixel_api.json", exp=28_800)
-
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "pixel.json", exp=10_800)
 
 BASE_URL = "https://pixelsport.tv/backend/livetv/events"
 
+API_TTL = 28_800
+
+WINDOW = 1_800
+
 
-async def refresh_api_cache(
+async def get_api_data(
     client: httpx.AsyncClient,
     url: str,
-    ts: float,
 ) -> dict[str, list[dict, str, str]]:
-    log.info("Refreshing API cache")
 
     try:
-        r = await client.get(url)
+        r = await client.get(url, extensions={"cache": API_TTL, "host_class": "api"})
         r.raise_for_status()
     except Exception as e:
         log.error(f'Failed to fetch "{url}": {e}')
         return {}
 
-    data = r.json()
+    return await offload.json(r.content)
 
-    data["timestamp"] = ts
 
-    return data
+def event_times() -> list[float]:
+    if not (api_data := network.cache.peek_json(BASE_URL, API_TTL)):
+        return []
+
+    return [
+        Time.from_str(f'{event["date"]} UTC', "%Y-%m-%dT%H:%M:%S.%fZ").timestamp()
+        for event in api_data["events"]
+    ]
 
 
 async def get_events(
@@ -43,14 +49,7 @@ async def get_events(
 ) -> dict[str, str | float]:
     now = Time.clean(Time.now())
 
-    if not (api_data := API_FILE.load(per_entry=False)):
-        api_data = await refresh_api_cache(
-            client,
-            BASE_URL,
-            now.timestamp(),
-        )
-
-        API_FILE.write(api_data)
+    api_data = await get_api_data(client, BASE_URL)
 
     events = {}
 
@@ -60,7 +59,7 @@ async def get_events(
     )
 
     start_dt = now.delta(minutes=-30)
-    end_dt = now.delta(minutes=30)
+    end_dt = now.delta(seconds=WINDOW)
 
     for event in api_data["events"]:
         event_dt = Time.from_str(f'{event["date"]} UTC', "%Y-%m-%dT%H:%M:%S.%fZ")
@@ -101,7 +100,7 @@ async def get_events(
 
 
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
     cached_count = len(cached_urls)
     urls.update(cached_urls)
 
@@ -120,4 +119,4 @@ async def scrape(client: httpx.AsyncClient) -> None:
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
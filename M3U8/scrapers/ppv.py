@@ -1,59 +1,76 @@
 from functools import partial
 from pathlib import Path
+from typing import Any
 from urllib.parse import urljoin
 
 import httpx
-from playwright.async_api import async_playwright
 
-from .utils import Cache, Time, get_logger, leagues, network
+from .utils import (
+    Cache,
+    Time,
+    browsers,
+    get_logger,
+    leagues,
+    network,
+    offload,
+    resolver,
+)
 
 log = get_logger(__name__)
 
 urls: dict[str, dict[str, str | float]] = {}
 
-API_FILE = Cache(Path(__file__).parent / "caches" / "ppv_api.json", exp=28_800)
-
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "ppv.json", exp=10_800)
 
+PAGE_WORKERS = 4
+
 BASE_URL = "https://ppv.to"
 
+API_URL = urljoin(BASE_URL, "api/streams")
 
-async def refresh_api_cache(
-    client: httpx.AsyncClient,
-    url: str,
-) -> dict[str, dict[str, str]]:
-    log.info("Refreshing API cache")
+API_TTL = 28_800
 
+WINDOW = 1_800
+
+
+async def get_api_data(url: str) -> dict[str, dict[str, str]]:
     try:
-        r = await client.get(url)
+        r = await network.hedged_get(
+            url,
+            extensions={"cache": API_TTL, "host_class": "api"},
+        )
         r.raise_for_status()
     except Exception as e:
         log.error(f'Failed to fetch "{url}": {e}')
         return {}
 
-    return r.json()
+    return await offload.json(r.content)
+
+
+def event_times() -> list[float]:
+    if not (api_data := network.cache.peek_json(API_URL, API_TTL)):
+        return []
+
+    return [
+        start_ts
+        for stream_group in api_data["streams"]
+        if stream_group["category"] != "24/7 Streams"
+        for event in stream_group["streams"]
+        if (start_ts := event.get("starts_at"))
+    ]
 
 
 async def get_events(
     client: httpx.AsyncClient,
     cached_keys: set[str],
 ) -> list[dict[str, str]]:
-    if not (api_data := API_FILE.load(per_entry=False)):
-        api_data = await refresh_api_cache(
-            client,
-            urljoin(
-                BASE_URL,
-                "api/streams",
-            ),
-        )
-
-        API_FILE.write(api_data)
+    api_data = await get_api_data(API_URL)
 
     events: list[dict[str, str]] = []
 
     now = Time.clean(Time.now())
     start_dt = now.delta(minutes=-30)
-    end_dt = now.delta(minutes=30)
+    end_dt = now.delta(seconds=WINDOW)
 
     for stream_group in api_data["streams"]:
         sport = stream_group["category"]
@@ -93,10 +110,27 @@ async def get_events(
     return events
 
 
+def defer(key: str, entry: dict[str, Any], url_num: int) -> dict[str, Any]:
+    return resolver.add(
+        key,
+        entry,
+        partial(
+            network.process_event,
+            url=entry["link"],
+            url_num=url_num,
+            timeout=6,
+            log=log,
+        ),
+        browser="firefox",
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
+    deferred = resolver.restore(cached_urls, defer)
     cached_count = len(cached_urls)
     urls.update(cached_urls)
+    urls.update(deferred)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
@@ -106,26 +140,44 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Processing {len(events)} new URL(s)")
 
-    if events:
-        async with async_playwright() as p:
-            browser, context = await network.browser(p)
-
-            for i, ev in enumerate(events, start=1):
-                handler = partial(
-                    network.process_event,
-                    url=ev["link"],
-                    url_num=i,
-                    context=context,
-                    timeout=6,
-                    log=log,
-                )
-
-                url = await network.safe_process(
-                    handler,
-                    url_num=i,
-                    log=log,
-                )
+    if events and resolver.enabled:
+        for i, ev in enumerate(events, start=1):
+            sport, event, logo, ts = (
+                ev["sport"],
+                ev["event"],
+                ev["logo"],
+                ev["timestamp"],
+            )
+
+            key = f"[{sport}] {event} (PPV)"
+
+            tvg_id, pic = leagues.get_tvg_info(sport, event)
+
+            entry = {
+                "logo": logo or pic,
+                "base": BASE_URL,
+                "timestamp": ts,
+                "id": tvg_id or "Live.Event.us",
+                "link": ev["link"],
+            }
+
+            urls[key] = defer(key, entry, i)
 
+            cached_urls[key] = resolver.placeholder(entry)
+
+        log.info(f"Deferred {len(events)} event(s) for on-demand resolution")
+
+    elif events:
+        async with browsers.lease() as lease:
+            results = await network.extract(
+                events,
+                partial(network.process_event, timeout=6, log=log),
+                lease.context,
+                log=log,
+                workers=PAGE_WORKERS,
+            )
+
+            for ev, url in zip(events, results):
                 if url:
                     sport, event, logo, ts = (
                         ev["sport"],
@@ -148,11 +200,9 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
                     urls[key] = cached_urls[key] = entry
 
-            await browser.close()
-
     if new_count := len(cached_urls) - cached_count:
         log.info(f"Collected and cached {new_count} new event(s)")
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
@@ -7,7 +7,7 @@ from urllib.parse import urljoin
 import httpx
 from selectolax.parser import HTMLParser
 
-from .utils import Cache, Time, get_logger, leagues, network
+from .utils import Cache, Time, get_logger, leagues, network, offload
 
 log = get_logger(__name__)
 
@@ -19,48 +19,30 @@ CACHE_FILE = Cache(Path(__file__).parent / "caches" / "roxie.json", exp=10_800)
 
 HTML_CACHE = Cache(Path(__file__).parent / "caches" / "roxie_html.json", exp=28_800)
 
+WINDOW = 1_800
 
-async def process_event(
-    client: httpx.AsyncClient,
-    url: str,
-    url_num: int,
-) -> str | None:
-
-    try:
-        r = await client.get(url)
-        r.raise_for_status()
-    except Exception as e:
-        log.error(f'URL {url_num}) Failed to fetch "{url}": {e}')
-        return
 
+async def process_event(url: str, url_num: int) -> str | None:
     valid_m3u8 = re.compile(
         r"showPlayer\(['\"]clappr['\"],\s*['\"]([^'\"]+?\.m3u8(?:\?[^'\"]*)?)['\"]\)",
         re.IGNORECASE,
     )
 
-    if match := valid_m3u8.search(r.text):
+    try:
+        match = await network.scan(url, valid_m3u8)
+    except Exception as e:
+        log.error(f'URL {url_num}) Failed to fetch "{url}": {e}')
+        return
+
+    if match:
         log.info(f"URL {url_num}) Captured M3U8")
         return match[1]
 
     log.info(f"URL {url_num}) No M3U8 found")
 
 
-async def refresh_html_cache(
-    client: httpx.AsyncClient,
-    url: str,
-    sport: str,
-    now_ts: float,
-) -> dict[str, str | float]:
-
-    try:
-        r = await client.get(url)
-        r.raise_for_status()
-    except Exception as e:
-        log.error(f'Failed to fetch "{url}": {e}')
-
-        return {}
-
-    soup = HTMLParser(r.text)
+def parse_events(html: str, sport: str, now_ts: float) -> dict[str, str | float]:
+    soup = HTMLParser(html)
 
     events = {}
 
@@ -95,6 +77,28 @@ async def refresh_html_cache(
     return events
 
 
+async def refresh_html_cache(
+    client: httpx.AsyncClient,
+    url: str,
+    sport: str,
+    now_ts: float,
+) -> dict[str, str | float]:
+
+    try:
+        r = await client.get(url, extensions={"host_class": "page"})
+        r.raise_for_status()
+    except Exception as e:
+        log.error(f'Failed to fetch "{url}": {e}')
+
+        return {}
+
+    return await offload.run(parse_events, r.text, sport, now_ts, size=len(r.text))
+
+
+def event_times() -> list[float]:
+    return [v["event_ts"] for v in HTML_CACHE.load().values()]
+
+
 async def get_events(
     client: httpx.AsyncClient,
     sport_urls: dict[str, str],
@@ -103,7 +107,7 @@ async def get_events(
 
     now = Time.clean(Time.now())
 
-    if not (events := HTML_CACHE.load()):
+    if not (events := await HTML_CACHE.aload()):
         tasks = [
             refresh_html_cache(
                 client,
@@ -118,12 +122,12 @@ async def get_events(
 
         events = {k: v for data in results for k, v in data.items()}
 
-        HTML_CACHE.write(events)
+        await HTML_CACHE.awrite(events)
 
     live = []
 
     start_ts = now.delta(minutes=-30).timestamp()
-    end_ts = now.delta(minutes=30).timestamp()
+    end_ts = now.delta(seconds=WINDOW).timestamp()
 
     for k, v in events.items():
         if cached_keys & {k}:
@@ -138,7 +142,7 @@ async def get_events(
 
 
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
     cached_count = len(cached_urls)
     urls.update(cached_urls)
 
@@ -146,7 +150,7 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     if not (base_url := await network.get_base(MIRRORS)):
         log.warning("No working Roxie mirrors")
-        CACHE_FILE.write(cached_urls)
+        await CACHE_FILE.awrite(cached_urls)
         return
 
     log.info(f'Scraping from "{base_url}"')
@@ -165,20 +169,22 @@ async def scrape(client: httpx.AsyncClient) -> None:
     log.info(f"Processing {len(events)} new URL(s)")
 
     if events:
-        for i, ev in enumerate(events, start=1):
-            handler = partial(
-                process_event,
-                client=client,
-                url=ev["link"],
-                url_num=i,
-            )
-
-            url = await network.safe_process(
-                handler,
-                url_num=i,
-                log=log,
+        results = await asyncio.gather(
+            *(
+                network.safe_process(
+                    partial(
+                        process_event,
+                        url=ev["link"],
+                        url_num=i,
+                    ),
+                    url_num=i,
+                    log=log,
+                )
+                for i, ev in enumerate(events, start=1)
             )
+        )
 
+        for ev, url in zip(events, results):
             if url:
                 sport, event, ts = ev["sport"], ev["event"], ev["event_ts"]
 
@@ -201,4 +207,4 @@ async def scrape(client: httpx.AsyncClient) -> None:
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from functools import partial
 from pathlib import Path
@@ -6,7 +7,7 @@ from urllib.parse import urljoin
 import httpx
 from selectolax.parser import HTMLParser
 
-from .utils import Cache, Time, get_logger, leagues, network
+from .utils import Cache, Time, get_logger, leagues, network, offload
 
 log = get_logger(__name__)
 
@@ -17,41 +18,27 @@ BASE_URL = "https://streambtw.com"
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "streambtw.json", exp=3_600)
 
 
-async def process_event(
-    client: httpx.AsyncClient,
-    url: str,
-    url_num: int,
-) -> str | None:
+async def process_event(url: str, url_num: int) -> str | None:
+    valid_m3u8 = re.compile(
+        r'var\s+(\w+)\s*=\s*["\']?(https?:\/\/[^"\'\s>]+\.m3u8(?:\?[^"\'\s>]*)?)["\']?',
+        re.IGNORECASE,
+    )
 
     try:
-        r = await client.get(url)
-        r.raise_for_status()
+        match = await network.scan(url, valid_m3u8)
     except Exception as e:
         log.error(f'URL {url_num}) Failed to fetch "{url}": {e}')
         return
 
-    valid_m3u8 = re.compile(
-        r'var\s+(\w+)\s*=\s*["\']?(https?:\/\/[^"\'\s>]+\.m3u8(?:\?[^"\'\s>]*)?)["\']?',
-        re.IGNORECASE,
-    )
-
-    if match := valid_m3u8.search(r.text):
+    if match:
         log.info(f"URL {url_num}) Captured M3U8")
         return match[2]
 
     log.info(f"URL {url_num}) No M3U8 found")
 
 
-async def get_events(client: httpx.AsyncClient) -> list[dict[str, str]]:
-    try:
-        r = await client.get(BASE_URL)
-        r.raise_for_status()
-    except Exception as e:
-        log.error(f'Failed to fetch "{BASE_URL}": {e}')
-
-        return []
-
-    soup = HTMLParser(r.text)
+def parse_events(html: str) -> list[dict[str, str]]:
+    soup = HTMLParser(html)
 
     events = []
 
@@ -76,8 +63,20 @@ async def get_events(client: httpx.AsyncClient) -> list[dict[str, str]]:
     return events
 
 
+async def get_events(client: httpx.AsyncClient) -> list[dict[str, str]]:
+    try:
+        r = await client.get(BASE_URL, extensions={"host_class": "page"})
+        r.raise_for_status()
+    except Exception as e:
+        log.error(f'Failed to fetch "{BASE_URL}": {e}')
+
+        return []
+
+    return await offload.run(parse_events, r.text, size=len(r.text))
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    if cached := CACHE_FILE.load():
+    if cached := await CACHE_FILE.aload():
         urls.update(cached)
         log.info(f"Loaded {len(urls)} event(s) from cache")
         return
@@ -91,21 +90,23 @@ async def scrape(client: httpx.AsyncClient) -> None:
     if events:
         now = Time.now().timestamp()
 
-        for i, ev in enumerate(events, start=1):
-            handler = partial(
-                process_event,
-                client=client,
-                url=ev["link"],
-                url_num=i,
-            )
-
-            url = await network.safe_process(
-                handler,
-                url_num=i,
-                log=log,
-                timeout=10,
+        results = await asyncio.gather(
+            *(
+                network.safe_process(
+                    partial(
+                        process_event,
+                        url=ev["link"],
+                        url_num=i,
+                    ),
+                    url_num=i,
+                    log=log,
+                    timeout=10,
+                )
+                for i, ev in enumerate(events, start=1)
             )
+        )
 
+        for ev, url in zip(events, results):
             if url:
                 sport, event = ev["sport"], ev["event"]
 
@@ -125,4 +126,4 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Collected {len(urls)} event(s)")
 
-    CACHE_FILE.write(urls)
+    await CACHE_FILE.awrite(urls)
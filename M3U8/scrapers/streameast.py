@@ -1,12 +1,21 @@
 from functools import partial
 from pathlib import Path
+from typing import Any
 from urllib.parse import urljoin
 
 import httpx
-from playwright.async_api import async_playwright
 from selectolax.parser import HTMLParser
 
-from .utils import Cache, Time, get_logger, leagues, network
+from .utils import (
+    Cache,
+    Time,
+    browsers,
+    get_logger,
+    leagues,
+    network,
+    offload,
+    resolver,
+)
 
 log = get_logger(__name__)
 
@@ -14,6 +23,8 @@ urls: dict[str, dict[str, str | float]] = {}
 
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "streameast.json", exp=10_800)
 
+PAGE_WORKERS = 3
+
 MIRRORS = [
     "https://streameast.ch",
     "https://streameast.sg",
@@ -32,20 +43,12 @@ MIRRORS = [
 ]
 
 
-async def get_events(
-    client: httpx.AsyncClient,
+def parse_events(
+    html: str,
     url: str,
     cached_keys: set[str],
 ) -> list[dict[str, str]]:
-    try:
-        r = await client.get(url)
-        r.raise_for_status()
-    except Exception as e:
-        log.error(f'Failed to fetch "{url}": {e}')
-
-        return []
-
-    soup = HTMLParser(r.text)
+    soup = HTMLParser(html)
     events = []
 
     now = Time.clean(Time.now())
@@ -100,16 +103,51 @@ async def get_events(
     return events
 
 
+async def get_events(
+    client: httpx.AsyncClient,
+    url: str,
+    cached_keys: set[str],
+) -> list[dict[str, str]]:
+    if not (html := network.probed_body(url)):
+        try:
+            r = await client.get(url, extensions={"host_class": "page"})
+            r.raise_for_status()
+        except Exception as e:
+            log.error(f'Failed to fetch "{url}": {e}')
+
+            return []
+
+        html = r.text
+
+    return await offload.run(parse_events, html, url, cached_keys, size=len(html))
+
+
+def defer(key: str, entry: dict[str, Any], url_num: int) -> dict[str, Any]:
+    return resolver.add(
+        key,
+        entry,
+        partial(
+            network.process_event,
+            url=entry["link"],
+            url_num=url_num,
+            log=log,
+        ),
+        browser="brave",
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
+    deferred = resolver.restore(cached_urls, defer)
     cached_count = len(cached_urls)
     urls.update(cached_urls)
+    urls.update(deferred)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
-    if not (base_url := await network.get_base(MIRRORS)):
+    if not (base_url := await network.get_base(MIRRORS, keep_body=True)):
         log.warning("No working StreamEast mirrors")
-        CACHE_FILE.write(cached_urls)
+        await CACHE_FILE.awrite(cached_urls)
         return
 
     log.info(f'Scraping from "{base_url}"')
@@ -122,25 +160,39 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Processing {len(events)} new URL(s)")
 
-    if events:
-        async with async_playwright() as p:
-            browser, context = await network.browser(p, browser="brave")
-
-            for i, ev in enumerate(events, start=1):
-                handler = partial(
-                    network.process_event,
-                    url=ev["link"],
-                    url_num=i,
-                    context=context,
-                    log=log,
-                )
+    if events and resolver.enabled:
+        for i, ev in enumerate(events, start=1):
+            sport, event, ts = ev["sport"], ev["event"], ev["timestamp"]
 
-                url = await network.safe_process(
-                    handler,
-                    url_num=i,
-                    log=log,
-                )
+            tvg_id, logo = leagues.get_tvg_info(sport, event)
+
+            key = f"[{sport}] {event} (SEAST)"
+
+            entry = {
+                "logo": logo,
+                "base": "https://embedsports.top/",
+                "timestamp": ts,
+                "id": tvg_id or "Live.Event.us",
+                "link": ev["link"],
+            }
 
+            urls[key] = defer(key, entry, i)
+
+            cached_urls[key] = resolver.placeholder(entry)
+
+        log.info(f"Deferred {len(events)} event(s) for on-demand resolution")
+
+    elif events:
+        async with browsers.lease(browser="brave") as lease:
+            results = await network.extract(
+                events,
+                partial(network.process_event, log=log),
+                lease.context,
+                log=log,
+                workers=PAGE_WORKERS,
+            )
+
+            for ev, url in zip(events, results):
                 if url:
                     sport, event, ts = ev["sport"], ev["event"], ev["timestamp"]
 
@@ -158,11 +210,9 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
                     urls[key] = cached_urls[key] = entry
 
-            await browser.close()
-
     if new_count := len(cached_urls) - cached_count:
         log.info(f"Collected and cached {new_count} new event(s)")
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
@@ -6,20 +6,36 @@ from typing import Any
 from urllib.parse import urljoin
 
 import httpx
-from playwright.async_api import BrowserContext, async_playwright
-
-from .utils import Cache, Time, get_logger, leagues, network
+from playwright.async_api import BrowserContext
+
+from .utils import (
+    Cache,
+    RoutePolicy,
+    Time,
+    browsers,
+    get_logger,
+    leagues,
+    network,
+    offload,
+    resolver,
+)
 
 log = get_logger(__name__)
 
 urls: dict[str, dict[str, str | float]] = {}
 
-API_FILE = Cache(Path(__file__).parent / "caches" / "strmd_api.json", exp=28_800)
-
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "strmd.json", exp=10_800)
 
+PAGE_WORKERS = 3
+
+BLOCK = RoutePolicy(resource_types={"font", "image", "media"})
+
 MIRRORS = ["https://streamed.pk", "https://streami.su", "https://streamed.st"]
 
+API_TTL = 28_800
+
+WINDOW = 1_800
+
 
 def validate_category(s: str) -> str:
     if "-" in s:
@@ -31,23 +47,18 @@ def validate_category(s: str) -> str:
     return s.capitalize() if len(s) >= 4 else s.upper()
 
 
-async def refresh_api_cache(
-    client: httpx.AsyncClient, url: str
-) -> list[dict[str, Any]]:
-    log.info("Refreshing API cache")
-
+async def get_api_data(urls: list[str]) -> list[dict[str, Any]]:
     try:
-        r = await client.get(url)
+        r = await network.hedged_get(
+            urls,
+            extensions={"cache": API_TTL, "host_class": "api"},
+        )
         r.raise_for_status()
     except Exception as e:
-        log.error(f'Failed to fetch "{url}": {e}')
+        log.error(f'Failed to fetch "{urls[0]}": {e}')
         return {}
 
-    data = r.json()
-
-    data[-1]["timestamp"] = Time.now().timestamp()
-
-    return data
+    return await offload.json(r.content)
 
 
 async def process_event(
@@ -72,31 +83,16 @@ async def process_event(
     page.on("request", handler)
 
     try:
-        await page.goto(
-            url,
-            wait_until="domcontentloaded",
-            timeout=15_000,
-        )
-
-        wait_task = asyncio.create_task(got_one.wait())
+        await network.goto(page, url)
 
         try:
             await page.click(".jw-icon-display")
 
-            await asyncio.wait_for(wait_task, timeout=timeout)
+            await network.wait_m3u8(url, got_one, timeout)
         except asyncio.TimeoutError:
             log.warning(f"URL {url_num}) Timed out waiting for M3U8.")
             return
 
-        finally:
-            if not wait_task.done():
-                wait_task.cancel()
-
-                try:
-                    await wait_task
-                except asyncio.CancelledError:
-                    pass
-
         if captured:
             log.info(f"URL {url_num}) Captured M3U8")
             return captured[0]
@@ -113,28 +109,40 @@ async def process_event(
         await page.close()
 
 
+def event_times() -> list[float]:
+    for base_url in MIRRORS:
+        url = urljoin(base_url, "api/matches/all-today")
+
+        if api_data := network.cache.peek_json(url, API_TTL):
+            break
+    else:
+        return []
+
+    return [
+        int(str(ts)[:-3])
+        for event in api_data
+        if event["category"] != "other" and (ts := event["date"])
+    ]
+
+
 async def get_events(
     client: httpx.AsyncClient,
     base_url: str,
     cached_keys: set[str],
 ) -> list[dict[str, str]]:
 
-    if not (api_data := API_FILE.load(per_entry=False, index=-1)):
-        api_data = await refresh_api_cache(
-            client,
-            urljoin(
-                base_url,
-                "api/matches/all-today",
-            ),
-        )
-
-        API_FILE.write(api_data)
+    api_data = await get_api_data(
+        [
+            urljoin(mirror, "api/matches/all-today")
+            for mirror in network.alternates(base_url, MIRRORS)
+        ]
+    )
 
     events: list[dict[str, str]] = []
 
     now = Time.clean(Time.now())
     start_dt = now.delta(minutes=-30)
-    end_dt = now.delta(minutes=30)
+    end_dt = now.delta(seconds=WINDOW)
     pattern = re.compile(r"[\n\r]+|\s{2,}")
 
     for event in api_data:
@@ -190,16 +198,32 @@ async def get_events(
     return events
 
 
+def defer(key: str, entry: dict[str, Any], url_num: int) -> dict[str, Any]:
+    return resolver.add(
+        key,
+        entry,
+        partial(
+            process_event,
+            url=entry["link"],
+            url_num=url_num,
+        ),
+        browser="brave",
+        block=BLOCK,
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
+    deferred = resolver.restore(cached_urls, defer)
     cached_count = len(cached_urls)
     urls.update(cached_urls)
+    urls.update(deferred)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
     if not (base_url := await network.get_base(MIRRORS)):
         log.warning("No working PPV mirrors")
-        CACHE_FILE.write(cached_urls)
+        await CACHE_FILE.awrite(cached_urls)
         return
 
     log.info(f'Scraping from "{base_url}"')
@@ -212,24 +236,44 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Processing {len(events)} new URL(s)")
 
-    if events:
-        async with async_playwright() as p:
-            browser, context = await network.browser(p, browser="brave")
+    if events and resolver.enabled:
+        for i, ev in enumerate(events, start=1):
+            sport, event, logo, ts = (
+                ev["sport"],
+                ev["event"],
+                ev["logo"],
+                ev["timestamp"],
+            )
+
+            key = f"[{sport}] {event} (STRMD)"
+
+            tvg_id, pic = leagues.get_tvg_info(sport, event)
+
+            entry = {
+                "logo": logo or pic,
+                "base": "https://embedsports.top/",
+                "timestamp": ts,
+                "id": tvg_id or "Live.Event.us",
+                "link": ev["link"],
+            }
 
-            for i, ev in enumerate(events, start=1):
-                handler = partial(
-                    process_event,
-                    url=ev["link"],
-                    url_num=i,
-                    context=context,
-                )
+            urls[key] = defer(key, entry, i)
 
-                url = await network.safe_process(
-                    handler,
-                    url_num=i,
-                    log=log,
-                )
+            cached_urls[key] = resolver.placeholder(entry)
 
+        log.info(f"Deferred {len(events)} event(s) for on-demand resolution")
+
+    elif events:
+        async with browsers.lease(browser="brave", block=BLOCK) as lease:
+            results = await network.extract(
+                events,
+                process_event,
+                lease.context,
+                log=log,
+                workers=PAGE_WORKERS,
+            )
+
+            for ev, url in zip(events, results):
                 if url:
                     sport, event, logo, ts = (
                         ev["sport"],
@@ -252,11 +296,9 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
                     urls[key] = cached_urls[key] = entry
 
-            await browser.close()
-
     if new_count := len(cached_urls) - cached_count:
         log.info(f"Collected and cached {new_count} new event(s)")
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
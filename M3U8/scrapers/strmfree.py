@@ -1,41 +1,77 @@
 from functools import partial
 from pathlib import Path
+from typing import Any
 from urllib.parse import urljoin
 
 import httpx
-from playwright.async_api import async_playwright
-
-from .utils import Cache, Time, get_logger, leagues, network
+from playwright.async_api import BrowserContext
+
+from .utils import (
+    Cache,
+    Time,
+    browsers,
+    get_logger,
+    leagues,
+    network,
+    offload,
+    resolver,
+)
 
 log = get_logger(__name__)
 
 urls: dict[str, dict[str, str | float]] = {}
 
-API_FILE = Cache(Path(__file__).parent / "caches" / "strmfree_api.json", exp=28_800)
-
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "strmfree.json", exp=10_800)
 
+PAGE_WORKERS = 4
+
 BASE_URL = "https://streamfree.to"
 
+API_TTL = 28_800
 
-async def refresh_api_cache(
+WINDOW = 900
+
+
+async def get_api_data(
     client: httpx.AsyncClient,
     url: str,
 ) -> dict[str, dict[str, list]]:
-    log.info("Refreshing API cache")
 
     try:
-        r = await client.get(url)
+        r = await client.get(url, extensions={"cache": API_TTL, "host_class": "api"})
         r.raise_for_status()
     except Exception as e:
         log.error(f'Failed to fetch "{url}": {e}')
         return {}
 
-    data = r.json()
+    return await offload.json(r.content)
+
+
+async def process_event(
+    url: str,
+    url_num: int,
+    context: BrowserContext,
+) -> str | None:
+
+    if m3u8 := await network.process_event(
+        url,
+        url_num,
+        context,
+        timeout=6,
+        log=log,
+    ):
+        return m3u8.replace("540p", "720p")
 
-    data["timestamp"] = Time.now().timestamp()
 
-    return data
+def event_times() -> list[float]:
+    if not (api_data := network.cache.peek_json(urljoin(BASE_URL, "streams"), API_TTL)):
+        return []
+
+    return [
+        stream["match_timestamp"]
+        for streams in api_data["streams"].values()
+        for stream in streams or []
+    ]
 
 
 async def get_events(
@@ -44,19 +80,13 @@ async def get_events(
     cached_keys: set[str],
 ) -> list[dict[str, str]]:
 
-    if not (api_data := API_FILE.load(per_entry=False)):
-        api_data = await refresh_api_cache(
-            client,
-            urljoin(url, "streams"),
-        )
-
-        API_FILE.write(api_data)
+    api_data = await get_api_data(client, urljoin(url, "streams"))
 
     events: list[dict[str, str]] = []
 
     now = Time.clean(Time.now())
     start_dt = now.delta(hours=-1)
-    end_dt = now.delta(minutes=15)
+    end_dt = now.delta(seconds=WINDOW)
 
     for category, streams in api_data["streams"].items():
         if not streams:
@@ -89,10 +119,25 @@ async def get_events(
     return events
 
 
+def defer(key: str, entry: dict[str, Any], url_num: int) -> dict[str, Any]:
+    return resolver.add(
+        key,
+        entry,
+        partial(
+            process_event,
+            url=entry["link"],
+            url_num=url_num,
+        ),
+        browser="firefox",
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
+    deferred = resolver.restore(cached_urls, defer)
     cached_count = len(cached_urls)
     urls.update(cached_urls)
+    urls.update(deferred)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
@@ -106,26 +151,43 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Processing {len(events)} new URL(s)")
 
-    if events:
-        async with async_playwright() as p:
-            browser, context = await network.browser(p)
-
-            for i, ev in enumerate(events, start=1):
-                handler = partial(
-                    network.process_event,
-                    url=ev["link"],
-                    url_num=i,
-                    context=context,
-                    timeout=6,
-                    log=log,
-                )
-
-                url = await network.safe_process(
-                    handler,
-                    url_num=i,
-                    log=log,
-                )
+    if events and resolver.enabled:
+        for i, ev in enumerate(events, start=1):
+            sport, event, ts = (
+                ev["sport"],
+                ev["event"],
+                ev["timestamp"],
+            )
+
+            key = f"[{sport}] {event} (STRMFR)"
+
+            tvg_id, logo = leagues.get_tvg_info(sport, event)
+
+            entry = {
+                "logo": logo,
+                "base": BASE_URL,
+                "timestamp": ts,
+                "id": tvg_id or "Live.Event.us",
+                "link": ev["link"],
+            }
 
+            urls[key] = defer(key, entry, i)
+
+            cached_urls[key] = resolver.placeholder(entry)
+
+        log.info(f"Deferred {len(events)} event(s) for on-demand resolution")
+
+    elif events:
+        async with browsers.lease() as lease:
+            results = await network.extract(
+                events,
+                process_event,
+                lease.context,
+                log=log,
+                workers=PAGE_WORKERS,
+            )
+
+            for ev, url in zip(events, results):
                 if url:
                     sport, event, ts = (
                         ev["sport"],
@@ -138,7 +200,7 @@ async def scrape(client: httpx.AsyncClient) -> None:
                     tvg_id, logo = leagues.get_tvg_info(sport, event)
 
                     entry = {
-                        "url": url.replace("540p", "720p"),
+                        "url": url,
                         "logo": logo,
                         "base": BASE_URL,
                         "timestamp": ts,
@@ -147,11 +209,9 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
                     urls[key] = cached_urls[key] = entry
 
-            await browser.close()
-
     if new_count := len(cached_urls) - cached_count:
         log.info(f"Collected and cached {new_count} new event(s)")
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
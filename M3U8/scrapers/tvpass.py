@@ -16,7 +16,7 @@ CACHE_FILE = Cache(Path(__file__).parent / "caches" / "tvpass.json", exp=86_400)
 
 async def fetch_m3u8(client: httpx.AsyncClient) -> list[str]:
     try:
-        r = await client.get(BASE_URL)
+        r = await client.get(BASE_URL, extensions={"host_class": "page"})
         r.raise_for_status()
     except Exception as e:
         log.error(f'Failed to fetch "{BASE_URL}": {e}')
@@ -26,7 +26,7 @@ async def fetch_m3u8(client: httpx.AsyncClient) -> list[str]:
 
 
 async def scrape(client: httpx.AsyncClient) -> None:
-    if cached := CACHE_FILE.load():
+    if cached := await CACHE_FILE.aload():
         urls.update(cached)
         log.info(f"Loaded {len(urls)} event(s) from cache")
         return
@@ -69,6 +69,6 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
                     urls[key] = entry
 
-    CACHE_FILE.write(urls)
+    await CACHE_FILE.awrite(urls)
 
     log.info(f"Cached {len(urls)} event(s)")
@@ -1,12 +1,39 @@
+from httpstack import get_logger
+
+from .browsers import browsers
 from .caching import Cache
 from .config import Time, leagues
-from .logger import get_logger
+from .history import History, tracked_scrape
+from .offload import offload
+from .relay import relay
+from .resolver import resolver
+from .routing import RoutePolicy
+from .scheduler import Scheduler
+from .server import server
+from .shards import run_shards
+from .snapshot import snapshot
 from .webwork import network
+from .workqueue import WorkQueue, drain, reduce_shards, work
 
 __all__ = [
     "Cache",
+    "History",
+    "RoutePolicy",
+    "Scheduler",
     "Time",
+    "WorkQueue",
+    "browsers",
+    "drain",
     "get_logger",
     "leagues",
     "network",
+    "offload",
+    "reduce_shards",
+    "relay",
+    "resolver",
+    "run_shards",
+    "server",
+    "snapshot",
+    "tracked_scrape",
+    "work",
 ]
@@ -0,0 +1,258 @@
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from httpstack import get_logger
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from .routing import RoutePolicy, default_policy
+from .webwork import Network
+
+INIT_SCRIPT = """
+            Object.defineProperty(navigator, "webdriver", { get: () => undefined });
+
+            Object.defineProperty(navigator, "languages", {
+            get: () => ["en-US", "en"],
+            });
+
+            Object.defineProperty(navigator, "plugins", {
+            get: () => [1, 2, 3, 4],
+            });
+
+            const elementDescriptor = Object.getOwnPropertyDescriptor(
+            HTMLElement.prototype,
+            "offsetHeight"
+            );
+
+            Object.defineProperty(HTMLDivElement.prototype, "offsetHeight", {
+            ...elementDescriptor,
+            get: function () {
+                if (this.id === "modernizr") {
+                return 24;
+                }
+                return elementDescriptor.get.apply(this);
+            },
+            });
+
+            Object.defineProperty(window.screen, "width", { get: () => 1366 });
+            Object.defineProperty(window.screen, "height", { get: () => 768 });
+
+            const getParameter = WebGLRenderingContext.prototype.getParameter;
+
+            WebGLRenderingContext.prototype.getParameter = function (param) {
+            if (param === 37445) return "Intel Inc."; //  UNMASKED_VENDOR_WEBGL
+            if (param === 37446) return "Intel Iris OpenGL    Engine"; // UNMASKED_RENDERER_WEBGL
+            return getParameter.apply(this, [param]);
+            };
+
+            const observer = new MutationObserver((mutations) => {
+            mutations.forEach((mutation) => {
+                mutation.addedNodes.forEach((node) => {
+                if (node.tagName === "IFRAME" && node.hasAttribute("sandbox")) {
+                    node.removeAttribute("sandbox");
+                }
+                });
+            });
+            });
+
+            observer.observe(document.documentElement, { childList: true, subtree: true });
+
+            """
+
+
+class SharedContext:
+    def __init__(self, context: BrowserContext, block: RoutePolicy | None) -> None:
+        self.context = context
+        self.block = block
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.context, name)
+
+    async def new_page(self) -> Page:
+        page = await self.context.new_page()
+
+        if self.block:
+            await self.block.apply(page)
+
+        return page
+
+
+class Lease:
+    def __init__(
+        self,
+        pool: "BrowserPool",
+        browser: str = "firefox",
+        ignore_https_errors: bool = False,
+        block: RoutePolicy | None = default_policy,
+    ) -> None:
+
+        self.pool = pool
+        self.browser = browser
+        self.ignore_https_errors = ignore_https_errors
+        self.block = block
+
+        self._context: BrowserContext | SharedContext | None = None
+        self._lock = asyncio.Lock()
+
+    async def context(self) -> BrowserContext:
+        async with self._lock:
+            if not self.pool.alive(self._context):
+                self._context = await self.pool.new_context(
+                    self.browser,
+                    self.ignore_https_errors,
+                )
+
+                if self.browser == "brave":
+                    self._context = SharedContext(self._context, self.block)
+
+                elif self.block:
+                    await self.block.apply(self._context)
+
+            return self._context
+
+    async def release(self) -> None:
+        context, self._context = self._context, None
+
+        if self.browser == "brave" or not self.pool.alive(context):
+            return
+
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    def __init__(self) -> None:
+        self.launches: Counter[str] = Counter()
+        self.policies: set[RoutePolicy] = set()
+
+        self._playwright: Playwright | None = None
+        self._browsers: dict[str, Browser] = {}
+        self._lock = asyncio.Lock()
+
+        self._logger = get_logger("browsers")
+
+    @staticmethod
+    def alive(context: BrowserContext | None) -> bool:
+        return bool(context and context.browser and context.browser.is_connected())
+
+    async def _launch(self, kind: str) -> Browser:
+        if kind == "brave":
+            return await self._playwright.chromium.connect_over_cdp(
+                "http://localhost:9222"
+            )
+
+        return await self._playwright.firefox.launch(headless=True)
+
+    async def get(self, kind: str) -> Browser:
+        async with self._lock:
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+
+            if (brwsr := self._browsers.get(kind)) and brwsr.is_connected():
+                return brwsr
+
+            if brwsr:
+                self._logger.warning(f"Browser {kind} disconnected, restarting")
+
+            brwsr = self._browsers[kind] = await self._launch(kind)
+
+            self.launches[kind] += 1
+
+            return brwsr
+
+    async def new_context(
+        self,
+        kind: str,
+        ignore_https_errors: bool = False,
+    ) -> BrowserContext:
+
+        brwsr = await self.get(kind)
+
+        if kind == "brave":
+            return brwsr.contexts[0]
+
+        context = await brwsr.new_context(
+            user_agent=Network.UA,
+            ignore_https_errors=ignore_https_errors,
+            viewport={"width": 1366, "height": 768},
+            device_scale_factor=1,
+            locale="en-US",
+            timezone_id="America/New_York",
+            color_scheme="dark",
+            permissions=["geolocation"],
+            extra_http_headers={
+                "Accept-Language": "en-US,en;q=0.9",
+                "Upgrade-Insecure-Requests": "1",
+            },
+        )
+
+        await context.add_init_script(INIT_SCRIPT)
+
+        return context
+
+    def checkout(
+        self,
+        browser: str = "firefox",
+        ignore_https_errors: bool = False,
+        block: RoutePolicy | None = default_policy,
+    ) -> Lease:
+
+        if block:
+            self.policies.add(block)
+
+        return Lease(self, browser, ignore_https_errors, block)
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        browser: str = "firefox",
+        ignore_https_errors: bool = False,
+        block: RoutePolicy | None = default_policy,
+    ) -> AsyncIterator[Lease]:
+
+        lease = self.checkout(browser, ignore_https_errors, block)
+
+        try:
+            yield lease
+        finally:
+            await lease.release()
+
+    async def close(self) -> None:
+        blocked = sum((policy.blocked for policy in self.policies), Counter())
+
+        if blocked:
+            self._logger.info(
+                f"Blocked {blocked.total()} browser request(s): "
+                + ", ".join(f"{kind}={n}" for kind, n in blocked.most_common())
+            )
+
+        for policy in self.policies:
+            policy.blocked.clear()
+
+        async with self._lock:
+            for brwsr in self._browsers.values():
+                try:
+                    await brwsr.close()
+                except Exception:
+                    pass
+
+            self._browsers.clear()
+
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+browsers = BrowserPool()
+
+__all__ = ["BrowserPool", "Lease", "SharedContext", "browsers"]
@@ -2,20 +2,20 @@ import json
 from pathlib import Path
 
 from .config import Time
+from .offload import offload
 
 
 class Cache:
     def __init__(self, file: Path, exp: int | float) -> None:
         self.file = file
         self.exp = exp
-        self.now_ts = Time.now().timestamp()
 
     def is_fresh(self, entry: dict) -> bool:
         ts: float | int = entry.get("timestamp", Time.default_8())
 
         dt_ts = Time.clean(Time.from_ts(ts)).timestamp()
 
-        return self.now_ts - dt_ts < self.exp
+        return Time.now().timestamp() - dt_ts < self.exp
 
     def load(
         self,
@@ -41,6 +41,19 @@ class Cache:
 
         return data if self.is_fresh({"timestamp": dt_ts}) else {}
 
+    async def aload(
+        self,
+        per_entry: bool = True,
+        index: int | None = None,
+    ) -> dict[str, dict[str, str | float]]:
+
+        try:
+            size = self.file.stat().st_size
+        except OSError:
+            size = 0
+
+        return await offload.run(self.load, per_entry, index, size=size)
+
     def write(self, data: dict) -> None:
         self.file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -53,5 +66,8 @@ class Cache:
             encoding="utf-8",
         )
 
+    async def awrite(self, data: dict) -> None:
+        await offload.run(self.write, data)
+
 
 __all__ = ["Cache"]
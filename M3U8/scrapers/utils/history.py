@@ -0,0 +1,98 @@
+import logging
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from .caching import Cache
+from .config import Time
+from .webwork import network
+
+
+class ErrorCounter(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+class History:
+    def __init__(
+        self,
+        file: Path,
+        grace: int = 2,
+        base: int | float = 1_800,
+        cap: int | float = 21_600,
+        keep: int = 48,
+    ) -> None:
+
+        self.enabled = True
+        self.cache = Cache(file, exp=604_800)
+        self.grace = grace
+        self.base = base
+        self.cap = cap
+        self.keep = keep
+
+        self.load()
+
+    def load(self) -> None:
+        self.data: dict[str, dict[str, Any]] = self.cache.load()
+
+    def next_due(self, name: str) -> float:
+        if not (entry := self.data.get(name)):
+            return 0
+
+        if (streak := entry.get("streak", 0)) < self.grace:
+            return 0
+
+        delay = min(self.base * 2 ** (streak - self.grace), self.cap)
+
+        return entry["timestamp"] + delay
+
+    def should_run(self, name: str) -> bool:
+        return not self.enabled or self.next_due(name) <= Time.now().timestamp()
+
+    def record(self, name: str, stats: dict[str, Any]) -> None:
+        entry = self.data.setdefault(name, {"runs": [], "streak": 0})
+
+        entry["runs"] = [*entry["runs"], stats][-self.keep :]
+        entry["streak"] = 0 if stats["new"] else entry["streak"] + 1
+        entry["timestamp"] = stats["ts"]
+
+    def save(self) -> None:
+        self.cache.write(self.data)
+
+
+async def tracked_scrape(mod: ModuleType) -> dict[str, Any]:
+    logger = logging.getLogger(mod.__name__)
+
+    counter = ErrorCounter()
+
+    logger.addHandler(counter)
+
+    before = set(await mod.CACHE_FILE.aload())
+
+    attempts = network.attempts[mod.__name__]
+
+    start = time.perf_counter()
+
+    try:
+        await mod.scrape(network.client)
+    except Exception as e:
+        logger.error(f"Scrape failed: {e}")
+    finally:
+        logger.removeHandler(counter)
+
+    return {
+        "ts": Time.now().timestamp(),
+        "found": network.attempts[mod.__name__] - attempts,
+        "new": len(set(mod.urls) - before),
+        "total": sum(1 for v in mod.urls.values() if v.get("url")),
+        "elapsed": round(time.perf_counter() - start, 2),
+        "errors": counter.count,
+    }
+
+
+__all__ = ["History", "tracked_scrape"]
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+from .caching import Cache
+from .config import Time
+
+
+class Mirrors:
+    def __init__(
+        self,
+        file: Path,
+        alpha: float = 0.3,
+        stagger: int | float = 0.3,
+        dead_after: int = 3,
+        retry: int | float = 3_600,
+    ) -> None:
+
+        self.cache = Cache(file, exp=604_800)
+        self.alpha = alpha
+        self.stagger = stagger
+        self.dead_after = dead_after
+        self.retry = retry
+
+        self.load()
+
+    def load(self) -> None:
+        self.data: dict[str, dict[str, float]] = self.cache.load()
+        self.recorded: set[str] = set()
+
+    def is_dead(self, url: str) -> bool:
+        if not (entry := self.data.get(url)):
+            return False
+
+        return (
+            entry.get("streak", 0) >= self.dead_after
+            and entry["timestamp"] + self.retry > Time.now().timestamp()
+        )
+
+    def order(self, mirrors: list[str]) -> list[str]:
+        alive = [url for url in mirrors if not self.is_dead(url)] or mirrors
+
+        return sorted(
+            alive,
+            key=lambda url: self.data.get(url, {}).get("latency", float("inf")),
+        )
+
+    def record(self, url: str, latency: float | None) -> None:
+        entry = self.data.setdefault(url, {"streak": 0})
+
+        if latency is None:
+            entry["streak"] = entry.get("streak", 0) + 1
+        else:
+            entry["streak"] = 0
+            entry["latency"] = round(
+                (
+                    latency
+                    if "latency" not in entry
+                    else self.alpha * latency + (1 - self.alpha) * entry["latency"]
+                ),
+                4,
+            )
+
+        entry["timestamp"] = Time.now().timestamp()
+
+        self.recorded.add(url)
+
+    def observations(self) -> dict[str, dict[str, float]]:
+        return {url: self.data[url] for url in self.recorded}
+
+    def merge(self, observations: dict[str, dict[str, float]]) -> None:
+        self.data.update(observations)
+        self.recorded.update(observations)
+
+    def save(self) -> None:
+        if not self.recorded:
+            return
+
+        self.cache.write(self.data)
+
+        self.recorded.clear()
+
+
+__all__ = ["Mirrors"]
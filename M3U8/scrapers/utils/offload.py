@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from selectolax.parser import HTMLParser
+
+T = TypeVar("T")
+
+
+class Offload:
+    def __init__(
+        self,
+        workers: int = 4,
+        inline_below: int = 16_384,
+        interval: int | float = 0.05,
+    ) -> None:
+
+        self.workers = workers
+        self.inline_below = inline_below
+        self.interval = interval
+
+        self.stats: Counter[str] = Counter()
+        self.timings: Counter[str] = Counter()
+
+        self.max_lag = 0.0
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._monitor: asyncio.Task | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                self.workers,
+                thread_name_prefix="offload",
+            )
+
+        return self._executor
+
+    async def _watch(self) -> None:
+        while True:
+            start = time.perf_counter()
+
+            await asyncio.sleep(self.interval)
+
+            if (lag := time.perf_counter() - start - self.interval) > 0.01:
+                self.timings["lag"] += lag
+                self.max_lag = max(self.max_lag, lag)
+
+    def monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        if self._monitor and not self._monitor.done():
+            if self._monitor.get_loop() is loop:
+                return
+
+        self._monitor = loop.create_task(self._watch())
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        size: int | None = None,
+    ) -> T:
+
+        self.monitor()
+
+        start = time.perf_counter()
+
+        if size is not None and size < self.inline_below:
+            result = fn(*args)
+
+            self.stats["inline"] += 1
+            self.timings["inline"] += time.perf_counter() - start
+
+            return result
+
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            partial(fn, *args),
+        )
+
+        self.stats["offloaded"] += 1
+        self.timings["offloaded"] += time.perf_counter() - start
+
+        return result
+
+    async def json(self, data: str | bytes) -> Any:
+        return await self.run(json.loads, data, size=len(data))
+
+    async def html(self, text: str) -> HTMLParser:
+        return await self.run(HTMLParser, text, size=len(text))
+
+    def summary(self) -> str | None:
+        if not (calls := self.stats["inline"] + self.stats["offloaded"]):
+            return None
+
+        return (
+            f"Parsed {calls} payload(s): "
+            f"{self.stats['inline']} inline ({self.timings['inline']:.2f}s on loop), "
+            f"{self.stats['offloaded']} offloaded ({self.timings['offloaded']:.2f}s); "
+            f"loop lag {self.timings['lag']:.2f}s total, {self.max_lag * 1_000:.0f}ms max"
+        )
+
+
+offload = Offload()
+
+__all__ = ["Offload", "offload"]
@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
+from pathlib import PurePosixPath
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+from httpstack import get_logger
+
+from .config import Time
+from .resolver import resolver
+from .server import Request, Response
+from .webwork import network
+
+M3U8_TYPE = "application/vnd.apple.mpegurl"
+
+
+class Relay:
+    PREFIX = "/relay/"
+
+    PLAYLIST_TAGS = ("#EXT-X-STREAM-INF", "#EXT-X-MEDIA", "#EXT-X-I-FRAME-STREAM-INF")
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_urls: int = 50_000,
+        playlist_ttl: int | float = 1,
+    ) -> None:
+
+        self.enabled = False
+        self.base_url = ""
+        self.max_bytes = max_bytes
+        self.max_urls = max_urls
+        self.playlist_ttl = playlist_ttl
+
+        self.channels: dict[str, dict[str, str]] = {}
+        self._urls: OrderedDict[str, tuple[str, str, bool]] = OrderedDict()
+        self._segments: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._playlists: dict[str, tuple[float, bytes]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        self._size = 0
+
+        self.hits = self.misses = 0
+
+        self._logger = get_logger("relay")
+
+    @staticmethod
+    def token(s: str) -> str:
+        return hashlib.blake2b(s.encode("utf-8"), digest_size=8).hexdigest()
+
+    def add(self, key: str, entry: dict[str, Any]) -> dict[str, Any]:
+        token = self.token(key)
+
+        self.channels[token] = {"key": key, "url": entry["url"], "base": entry["base"]}
+
+        return {**entry, "url": f"{self.base_url}{self.PREFIX}{token}.m3u8"}
+
+    @staticmethod
+    def headers(base: str) -> dict[str, str]:
+        headers = {"User-Agent": network.UA}
+
+        if base:
+            parts = urlsplit(base)
+
+            headers["Referer"] = base
+            headers["Origin"] = f"{parts.scheme}://{parts.netloc}"
+
+        return headers
+
+    def _register(self, token: str, url: str, playlist: bool) -> str:
+        rid = self.token(f"{token}:{url}")
+
+        suffix = PurePosixPath(urlsplit(url).path).suffix
+
+        if playlist:
+            suffix = ".m3u8"
+        elif not re.fullmatch(r"\.\w{1,5}", suffix):
+            suffix = ".ts"
+
+        self._urls[rid] = (token, url, playlist)
+        self._urls.move_to_end(rid)
+
+        while len(self._urls) > self.max_urls:
+            self._urls.popitem(last=False)
+
+        return f"{self.base_url}{self.PREFIX}{token}/{rid}{suffix}"
+
+    def rewrite(self, token: str, text: str, url: str) -> str:
+        lines = []
+
+        next_is_playlist = False
+
+        for line in text.splitlines():
+            stripped = line.strip()
+
+            if stripped.startswith("#"):
+                playlist = stripped.startswith(self.PLAYLIST_TAGS)
+
+                line = re.sub(
+                    r'URI="([^"]+)"',
+                    lambda m: (
+                        f'URI="{self._register(token, urljoin(url, m[1]), playlist)}"'
+                    ),
+                    line,
+                )
+
+                next_is_playlist = stripped.startswith("#EXT-X-STREAM-INF")
+
+            elif stripped:
+                line = self._register(token, urljoin(url, stripped), next_is_playlist)
+
+                next_is_playlist = False
+
+            lines.append(line)
+
+        return "\n".join(lines) + "\n"
+
+    async def _coalesce(self, rid: str, fn) -> Any:
+        if not (pending := self._pending.get(rid)):
+            pending = self._pending[rid] = asyncio.ensure_future(fn())
+
+            pending.add_done_callback(lambda _: self._pending.pop(rid, None))
+
+        return await asyncio.shield(pending)
+
+    async def _upstream(self, token: str) -> str | None:
+        channel = self.channels[token]
+
+        if (
+            resolver.enabled
+            and (job := resolver.token(channel["key"])) in resolver.jobs
+        ):
+            return await resolver.resolve(job)
+
+        return channel["url"]
+
+    async def _playlist(self, token: str, rid: str, url: str | None) -> bytes:
+        if (cached := self._playlists.get(rid)) and cached[0] > Time.now().timestamp():
+            return cached[1]
+
+        async def fetch() -> bytes:
+            upstream = url or await self._upstream(token)
+
+            if not upstream:
+                raise LookupError(token)
+
+            r = await network.client.get(
+                upstream,
+                headers=self.headers(self.channels[token]["base"]),
+            )
+
+            r.raise_for_status()
+
+            body = self.rewrite(token, r.text, str(r.url)).encode("utf-8")
+
+            now = Time.now().timestamp()
+
+            if len(self._playlists) > 1_000:
+                self._playlists = {
+                    k: v for k, v in self._playlists.items() if v[0] > now
+                }
+
+            self._playlists[rid] = (now + self.playlist_ttl, body)
+
+            return body
+
+        return await self._coalesce(rid, fetch)
+
+    async def _segment(self, token: str, rid: str, url: str) -> tuple[bytes, str]:
+        if cached := self._segments.get(rid):
+            self.hits += 1
+            self._segments.move_to_end(rid)
+            return cached
+
+        async def fetch() -> tuple[bytes, str]:
+            self.misses += 1
+
+            r = await network.client.get(
+                url,
+                headers=self.headers(self.channels[token]["base"]),
+                timeout=15,
+            )
+
+            r.raise_for_status()
+
+            segment = (r.content, r.headers.get("content-type", "video/mp2t"))
+
+            if len(r.content) <= self.max_bytes // 4:
+                self._segments[rid] = segment
+                self._size += len(r.content)
+
+                while self._size > self.max_bytes:
+                    _, (body, _) = self._segments.popitem(last=False)
+                    self._size -= len(body)
+
+            return segment
+
+        if rid in self._pending:
+            self.hits += 1
+
+        return await self._coalesce(rid, fetch)
+
+    async def handle(self, request: Request) -> Response:
+        path = request.path.removeprefix(self.PREFIX)
+
+        token, _, resource = path.partition("/")
+
+        try:
+            if not resource:
+                token = token.removesuffix(".m3u8")
+
+                if token not in self.channels:
+                    return Response.error(404)
+
+                body = await self._playlist(token, token, None)
+
+                return Response(200, body, {"Content-Type": M3U8_TYPE})
+
+            rid = PurePosixPath(resource).stem
+
+            if not (known := self._urls.get(rid)) or known[0] != token:
+                return Response.error(404)
+
+            _, url, playlist = known
+
+            if playlist:
+                body = await self._playlist(token, rid, url)
+
+                return Response(200, body, {"Content-Type": M3U8_TYPE})
+
+            body, content_type = await self._segment(token, rid, url)
+
+            return Response(200, body, {"Content-Type": content_type})
+
+        except Exception as e:
+            self._logger.warning(f'Failed to relay "{request.path}": {e}')
+            return Response.error(502)
+
+
+relay = Relay()
+
+__all__ = ["Relay", "relay"]
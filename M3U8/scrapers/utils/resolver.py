@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from httpstack import get_logger
+from playwright.async_api import BrowserContext
+
+from .browsers import Lease, browsers
+from .config import Time
+from .routing import RoutePolicy, default_policy
+from .server import Request, Response
+from .webwork import network
+
+
+class Resolver:
+    PREFIX = "/play/"
+
+    def __init__(
+        self,
+        ttl: int | float = 1_800,
+        fail_ttl: int | float = 60,
+        timeout: int | float = 20,
+    ) -> None:
+
+        self.enabled = False
+        self.base_url = ""
+        self.ttl = ttl
+        self.fail_ttl = fail_ttl
+        self.timeout = timeout
+
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self._results: dict[str, tuple[float, str | None]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+
+        self._leases: dict[tuple[str, bool, RoutePolicy | None], Lease] = {}
+
+        self._logger = get_logger("resolver")
+
+    @staticmethod
+    def token(key: str) -> str:
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+    def add(
+        self,
+        key: str,
+        entry: dict[str, Any],
+        fn: Callable[..., Awaitable[str | None]],
+        browser: str | None = None,
+        ignore_https_errors: bool = False,
+        block: RoutePolicy | None = default_policy,
+    ) -> dict[str, Any]:
+
+        token = self.token(key)
+
+        self.jobs[token] = {
+            "key": key,
+            "fn": fn,
+            "browser": browser,
+            "ignore_https_errors": ignore_https_errors,
+            "block": block,
+        }
+
+        return {**entry, "url": f"{self.base_url}{self.PREFIX}{token}"}
+
+    @staticmethod
+    def placeholder(entry: dict[str, Any]) -> dict[str, Any]:
+        return {**entry, "url": None, "lazy": True}
+
+    def restore(
+        self,
+        cached: dict[str, dict[str, Any]],
+        defer: Callable[[str, dict[str, Any], int], dict[str, Any]],
+    ) -> dict[str, dict[str, Any]]:
+
+        deferred = {k: v for k, v in cached.items() if v.get("lazy")}
+
+        if not self.enabled:
+            for key in deferred:
+                del cached[key]
+
+            return {}
+
+        return {
+            key: defer(key, entry, i)
+            for i, (key, entry) in enumerate(deferred.items(), start=1)
+        }
+
+    async def _context(
+        self,
+        browser: str,
+        ignore_https_errors: bool,
+        block: RoutePolicy | None,
+    ) -> BrowserContext:
+
+        if not (lease := self._leases.get((browser, ignore_https_errors, block))):
+            lease = self._leases[browser, ignore_https_errors, block] = (
+                browsers.checkout(browser, ignore_https_errors, block)
+            )
+
+        return await lease.context()
+
+    async def _run(self, token: str) -> str | None:
+        job = self.jobs[token]
+
+        self._logger.info(f'Resolving "{job["key"]}"')
+
+        fn = job["fn"]
+
+        if job["browser"]:
+
+            async def extract() -> str | None:
+                context = await self._context(
+                    job["browser"],
+                    job["ignore_https_errors"],
+                    job["block"],
+                )
+
+                return await job["fn"](context=context)
+
+            fn = extract
+
+        url = await network.safe_process(
+            fn,
+            url_num=token,
+            timeout=self.timeout,
+            log=self._logger,
+        )
+
+        ttl = self.ttl if url else self.fail_ttl
+
+        self._results[token] = (Time.now().timestamp() + ttl, url)
+
+        return url
+
+    async def resolve(self, token: str) -> str | None:
+        if token not in self.jobs:
+            raise KeyError(token)
+
+        if (result := self._results.get(token)) and result[0] > Time.now().timestamp():
+            return result[1]
+
+        if not (pending := self._pending.get(token)):
+            pending = self._pending[token] = asyncio.ensure_future(self._run(token))
+
+            pending.add_done_callback(lambda _: self._pending.pop(token, None))
+
+        return await asyncio.shield(pending)
+
+    async def handle(self, request: Request) -> Response:
+        token = request.path.removeprefix(self.PREFIX).strip("/")
+
+        try:
+            url = await self.resolve(token)
+        except KeyError:
+            return Response.error(404)
+
+        if not url:
+            return Response.error(502)
+
+        return Response.redirect(url)
+
+    async def close(self) -> None:
+        for lease in self._leases.values():
+            await lease.release()
+
+        self._leases.clear()
+
+
+resolver = Resolver()
+
+__all__ = ["Resolver", "resolver"]
@@ -0,0 +1,93 @@
+from collections import Counter
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Page, Route
+
+AD_DOMAINS = (
+    "a-ads.com",
+    "adnxs.com",
+    "adsco.re",
+    "adservice.google.com",
+    "adsterra.com",
+    "amazon-adsystem.com",
+    "clarity.ms",
+    "cloudflareinsights.com",
+    "criteo.com",
+    "disqus.com",
+    "doubleclick.net",
+    "exoclick.com",
+    "facebook.net",
+    "google-analytics.com",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "hilltopads.net",
+    "histats.com",
+    "hotjar.com",
+    "juicyads.com",
+    "mc.yandex.ru",
+    "mgid.com",
+    "moatads.com",
+    "onesignal.com",
+    "outbrain.com",
+    "popads.net",
+    "popcash.net",
+    "propellerads.com",
+    "pubmatic.com",
+    "quantserve.com",
+    "revcontent.com",
+    "rubiconproject.com",
+    "scorecardresearch.com",
+    "taboola.com",
+)
+
+
+class RoutePolicy:
+    RESOURCE_TYPES = frozenset({"font", "image", "media", "stylesheet"})
+
+    def __init__(
+        self,
+        resource_types: Iterable[str] | None = None,
+        domains: Iterable[str] | None = None,
+    ) -> None:
+
+        self.resource_types = frozenset(
+            self.RESOURCE_TYPES if resource_types is None else resource_types
+        )
+
+        self.domains = tuple(AD_DOMAINS if domains is None else domains)
+
+        self.blocked: Counter[str] = Counter()
+
+    def reason(self, url: str, resource_type: str) -> str | None:
+        if ".m3u8" in url:
+            return None
+
+        if resource_type in self.resource_types:
+            return resource_type
+
+        host = urlsplit(url).hostname or ""
+
+        if any(host == d or host.endswith(f".{d}") for d in self.domains):
+            return "tracker"
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+
+        try:
+            if reason := self.reason(request.url, request.resource_type):
+                self.blocked[reason] += 1
+                await route.abort("blockedbyclient")
+            else:
+                await route.fallback()
+        except Exception:
+            pass
+
+    async def apply(self, target: BrowserContext | Page) -> None:
+        await target.route("**/*", self.handle)
+
+
+default_policy = RoutePolicy()
+
+__all__ = ["AD_DOMAINS", "RoutePolicy", "default_policy"]
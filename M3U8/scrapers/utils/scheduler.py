@@ -0,0 +1,89 @@
+from collections.abc import Iterable
+from pathlib import Path
+
+from .caching import Cache
+from .config import Time
+
+
+class Scheduler:
+    def __init__(
+        self,
+        file: Path,
+        lead: int | float = 300,
+        window: int | float = 1_800,
+        idle: int | float = 3_600,
+    ) -> None:
+
+        self.state = Cache(file, exp=idle)
+        self.lead = lead
+        # scrapers floor their clock to the minute before applying the window
+        self.span = window - lead - 60
+        self.idle = idle
+
+    def last_run(self) -> float | None:
+        return self.state.load(per_entry=False).get("timestamp")
+
+    def mark(self, ts: float | None = None) -> None:
+        self.state.write({"timestamp": ts or Time.now().timestamp()})
+
+    def batches(
+        self,
+        start_times: Iterable[float],
+        now: float | None = None,
+    ) -> list[tuple[float, list[float]]]:
+
+        now = now or Time.now().timestamp()
+
+        last = self.last_run() or 0
+
+        pending = sorted(
+            {
+                ts
+                for ts in start_times
+                if ts - self.lead - self.span > last and ts > now - self.lead
+            }
+        )
+
+        batches: list[tuple[float, list[float]]] = []
+
+        for ts in pending:
+            if batches and ts - batches[-1][1][0] <= self.span:
+                batches[-1][1].append(ts)
+                continue
+
+            batches.append((max(ts - self.lead, now), [ts]))
+
+        return batches
+
+    def next_run(
+        self,
+        start_times: Iterable[float],
+        now: float | None = None,
+    ) -> tuple[float, list[float]]:
+
+        now = now or Time.now().timestamp()
+
+        if not (last := self.last_run()):
+            return now, []
+
+        idle_at = last + self.idle
+
+        if (batches := self.batches(start_times, now)) and batches[0][0] < idle_at:
+            return batches[0]
+
+        return max(idle_at, now), []
+
+    def is_due(
+        self,
+        start_times: Iterable[float],
+        within: int | float = 0,
+    ) -> bool:
+
+        now = Time.now().timestamp()
+
+        run_at, _ = self.next_run(start_times, now)
+
+        return run_at <= now + within
+
+
+__all__ = ["Scheduler"]
@@ -0,0 +1,316 @@
+import asyncio
+import gzip
+import hashlib
+from collections.abc import Awaitable, Callable
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from httpstack import get_logger
+
+STATUS = {
+    200: "OK",
+    302: "Found",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class Request:
+    def __init__(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        version: str = "HTTP/1.1",
+    ) -> None:
+
+        parts = urlsplit(target)
+
+        self.method = method
+        self.path = unquote(parts.path)
+        self.query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.version = version
+
+    def keep_alive(self) -> bool:
+        tokens = {
+            token.strip().lower()
+            for token in self.headers.get("connection", "").split(",")
+        }
+
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in tokens
+
+        return "close" not in tokens
+
+    def accepts_gzip(self) -> bool:
+        for coding in self.headers.get("accept-encoding", "").split(","):
+            name, _, params = coding.strip().partition(";")
+
+            if name.strip().lower() in ("gzip", "*"):
+                return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+
+        return False
+
+    def etags(self) -> set[str]:
+        return {
+            tag.strip().removeprefix("W/")
+            for tag in self.headers.get("if-none-match", "").split(",")
+            if tag.strip()
+        }
+
+
+class Response:
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes = b"",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    @classmethod
+    def redirect(cls, location: str) -> "Response":
+        return cls(302, headers={"Location": location, "Cache-Control": "no-store"})
+
+    @classmethod
+    def error(cls, status: int) -> "Response":
+        return cls(
+            status,
+            f"{status} {STATUS.get(status, '')}\n".encode(),
+            {"Content-Type": "text/plain; charset=utf-8", "Cache-Control": "no-store"},
+        )
+
+
+class Asset:
+    def __init__(self, body: bytes, content_type: str) -> None:
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+        self.content_type = content_type
+        self.modified = formatdate(usegmt=True)
+
+    def respond(self, request: Request) -> Response:
+        zipped = request.accepts_gzip()
+
+        etag = self.gzip_etag if zipped else self.etag
+
+        headers = {
+            "Content-Type": self.content_type,
+            "ETag": etag,
+            "Last-Modified": self.modified,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+
+        if (tags := request.etags()) and (etag in tags or "*" in tags):
+            return Response(304, headers=headers)
+
+        if zipped:
+            headers["Content-Encoding"] = "gzip"
+            return Response(200, self.gzipped, headers)
+
+        return Response(200, self.body, headers)
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class Server:
+    def __init__(self) -> None:
+        self.assets: dict[str, Asset] = {}
+        self.routes: dict[str, Handler] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._stats: dict[Path, tuple[float, int]] = {}
+        self._logger = get_logger("server")
+
+    def publish(
+        self,
+        path: str,
+        body: str | bytes,
+        content_type: str,
+    ) -> None:
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        if (current := self.assets.get(path)) and current.body == body:
+            return
+
+        self._store(path, Asset(body, content_type))
+
+    def _store(self, path: str, asset: Asset) -> None:
+        self.assets[path] = asset
+
+        self._logger.info(f'Published "{path}" ({len(asset.body):,} bytes)')
+
+    @staticmethod
+    def _stat(file: Path) -> tuple[float, int] | None:
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            return None
+
+        return stat.st_mtime, stat.st_size
+
+    async def publish_file(
+        self,
+        path: str,
+        file: Path,
+        content_type: str,
+    ) -> None:
+
+        if not (stat := self._stat(file)) or self._stats.get(file) == stat:
+            return
+
+        self._stats[file] = stat
+
+        body = await asyncio.to_thread(file.read_bytes)
+
+        if (current := self.assets.get(path)) and current.body == body:
+            return
+
+        self._store(path, await asyncio.to_thread(Asset, body, content_type))
+
+    async def watch_file(
+        self,
+        path: str,
+        file: Path,
+        content_type: str,
+        interval: int | float = 60,
+        settle: int | float = 1,
+    ) -> None:
+
+        while True:
+            if (stat := self._stat(file)) and self._stats.get(file) != stat:
+                await asyncio.sleep(settle)
+
+                if self._stat(file) == stat:
+                    await self.publish_file(path, file, content_type)
+
+            await asyncio.sleep(interval)
+
+    def route(self, prefix: str, handler: Handler) -> None:
+        self.routes[prefix] = handler
+
+    async def dispatch(self, request: Request) -> Response:
+        if request.method not in ("GET", "HEAD"):
+            return Response.error(405)
+
+        if asset := self.assets.get(request.path):
+            return asset.respond(request)
+
+        for prefix, handler in self.routes.items():
+            if request.path.startswith(prefix):
+                return await handler(request)
+
+        return Response.error(404)
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request:
+        head = await reader.readuntil(b"\r\n\r\n")
+
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+
+        method, target, version = request_line.split(" ", 2)
+
+        headers = {}
+
+        for line in header_lines:
+            if not line:
+                continue
+
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if length := int(headers.get("content-length", 0)):
+            await reader.readexactly(length)
+
+        return Request(method.upper(), target, headers, version.strip().upper())
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader),
+                        timeout=30,
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    request, response = None, Response.error(400)
+                else:
+                    try:
+                        response = await self.dispatch(request)
+                    except Exception as e:
+                        self._logger.error(f'Failed to handle "{request.path}": {e}')
+                        response = Response.error(502)
+
+                keep_alive = request is not None and request.keep_alive()
+
+                headers = {
+                    **response.headers,
+                    "Date": formatdate(usegmt=True),
+                    "Connection": "keep-alive" if keep_alive else "close",
+                }
+
+                if response.status != 304:
+                    headers["Content-Length"] = str(len(response.body))
+
+                head = (
+                    f"HTTP/1.1 {response.status} {STATUS.get(response.status, '')}\r\n"
+                )
+                head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+
+                writer.write(head.encode("latin-1") + b"\r\n")
+
+                if request is None or request.method != "HEAD":
+                    writer.write(response.body)
+
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        self._server = await asyncio.start_server(
+            self._handle,
+            host,
+            port,
+            backlog=1024,
+        )
+
+        self._logger.info(f"Serving on http://{host}:{port}")
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+server = Server()
+
+__all__ = ["Request", "Response", "Server", "server"]
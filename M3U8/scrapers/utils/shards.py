@@ -0,0 +1,117 @@
+import asyncio
+import importlib
+import json
+import multiprocessing as mp
+import os
+import signal
+import time
+from multiprocessing.connection import Connection
+
+from httpstack import get_logger
+
+from .webwork import network
+
+log = get_logger("shards")
+
+
+def _worker(names: list[str], conn: Connection) -> None:
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    from .browsers import browsers
+    from .history import tracked_scrape
+
+    modules = [importlib.import_module(name) for name in names]
+
+    async def run() -> list[dict]:
+        stats = await asyncio.gather(*(tracked_scrape(mod) for mod in modules))
+
+        await browsers.close()
+
+        network.log_summary()
+
+        await network.client.aclose()
+
+        return stats
+
+    stats = asyncio.run(run())
+
+    conn.send(
+        json.dumps(
+            {
+                "results": {
+                    mod.__name__: {"urls": mod.urls, "stats": mod_stats}
+                    for mod, mod_stats in zip(modules, stats)
+                },
+                "mirrors": network.mirrors.observations(),
+                "latency": network.latency.recorded,
+            }
+        )
+    )
+
+    conn.close()
+
+
+def _kill(proc: mp.Process) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+    proc.join()
+
+
+def run_shards(
+    groups: list[list[str]],
+    timeout: int | float = 600,
+) -> dict[str, dict[str, dict]]:
+
+    ctx = mp.get_context("spawn")
+
+    workers: list[tuple[list[str], mp.Process, Connection]] = []
+
+    for names in groups:
+        recv, send = ctx.Pipe(duplex=False)
+
+        proc = ctx.Process(target=_worker, args=(names, send), daemon=True)
+        proc.start()
+
+        send.close()
+
+        workers.append((names, proc, recv))
+
+    deadline = time.monotonic() + timeout
+
+    results: dict[str, dict[str, dict]] = {}
+
+    for names, proc, recv in workers:
+        try:
+            if recv.poll(max(deadline - time.monotonic(), 0)):
+                data = json.loads(recv.recv())
+
+                results |= data["results"]
+
+                network.mirrors.merge(data["mirrors"])
+
+                network.latency.merge(data["latency"])
+
+                proc.join(timeout=5)
+            else:
+                log.error(f"Worker for {', '.join(names)} timed out after {timeout}s")
+
+        except (EOFError, OSError) as e:
+            log.error(f"Worker for {', '.join(names)} died: {e}")
+
+        finally:
+            if proc.is_alive():
+                _kill(proc)
+
+            recv.close()
+
+    return results
+
+
+__all__ = ["run_shards"]
@@ -0,0 +1,122 @@
+import io
+import json
+import os
+import tarfile
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from httpstack import get_logger
+
+from .config import Time
+
+
+class Snapshot:
+    VERSION = 1
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.file: Path | None = None
+        self.meta: dict[str, Any] = {}
+
+        self._logger = get_logger("snapshot")
+
+    def restore(self) -> dict[str, Any]:
+        if not self.file:
+            return {}
+
+        try:
+            data = self.file.read_bytes()
+        except FileNotFoundError:
+            self._logger.info(f'No snapshot at "{self.file}", starting cold')
+            return {}
+
+        restored = 0
+
+        try:
+            with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+                manifest = json.load(tar.extractfile("manifest.json"))
+
+                if manifest.get("version") != self.VERSION:
+                    self._logger.warning(
+                        f"Ignoring snapshot version {manifest.get('version')}"
+                    )
+                    return {}
+
+                for member in tar.getmembers():
+                    path = PurePosixPath(member.name)
+
+                    if not member.isfile() or path.parts[0] != "caches":
+                        continue
+
+                    if ".." in path.parts:
+                        continue
+
+                    dest = self.cache_dir.joinpath(*path.parts[1:])
+
+                    if dest.exists() and dest.stat().st_mtime >= member.mtime:
+                        continue
+
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    dest.write_bytes(tar.extractfile(member).read())
+
+                    os.utime(dest, (member.mtime, member.mtime))
+
+                    restored += 1
+
+        except (tarfile.TarError, KeyError, ValueError) as e:
+            self._logger.warning(f'Failed to restore snapshot "{self.file}": {e}')
+            return {}
+
+        age = Time.now().timestamp() - manifest.get("created", 0)
+
+        self._logger.info(
+            f"Restored {restored} file(s) from snapshot ({age / 60:.0f} min old)"
+        )
+
+        self.meta = manifest
+
+        return manifest
+
+    def save(self, **meta: Any) -> None:
+        if not self.file:
+            return
+
+        buf = io.BytesIO()
+
+        manifest = json.dumps(
+            {
+                "version": self.VERSION,
+                "created": Time.now().timestamp(),
+                **meta,
+            }
+        ).encode("utf-8")
+
+        with tarfile.open(fileobj=buf, mode="w:gz", compresslevel=9) as tar:
+            info = tarfile.TarInfo("manifest.json")
+            info.size = len(manifest)
+            info.mtime = int(time.time())
+
+            tar.addfile(info, io.BytesIO(manifest))
+
+            for path in sorted(self.cache_dir.rglob("*")):
+                if path.is_file():
+                    tar.add(
+                        path,
+                        arcname=f"caches/{path.relative_to(self.cache_dir).as_posix()}",
+                    )
+
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = self.file.with_name(f"{self.file.name}.tmp")
+        tmp.write_bytes(buf.getvalue())
+        tmp.replace(self.file)
+
+        self._logger.info(
+            f'Saved snapshot to "{self.file}" ({len(buf.getvalue()) / 1024:.1f} KiB)'
+        )
+
+
+snapshot = Snapshot(Path(__file__).parent.parent / "caches")
+
+__all__ = ["Snapshot", "snapshot"]
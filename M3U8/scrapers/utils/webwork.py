@@ -1,56 +1,183 @@
 import asyncio
 import logging
 import re
+import time
+from collections import Counter
 from collections.abc import Awaitable, Callable
 from functools import partial
-from typing import TypeVar
+from pathlib import Path
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
 
 import httpx
-from playwright.async_api import Browser, BrowserContext, Playwright, Request
+from httpstack import HTTPStack
+from httpstack.adaptive import AdaptiveLimit
+from playwright.async_api import BrowserContext, Page, Request
 
-from .logger import get_logger
+from .mirrors import Mirrors
+from .offload import offload
 
 T = TypeVar("T")
 
 
-class Network:
-    UA = (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/134.0.0.0 Safari/537.36 Edg/134.0.0.0"
-    )
-
+class Network(HTTPStack):
     def __init__(self) -> None:
-        self.client = httpx.AsyncClient(
-            timeout=5,
-            follow_redirects=True,
-            headers={"User-Agent": Network.UA},
-            http2=True,
+        super().__init__(Path(__file__).parent.parent / "caches")
+
+        self.timeouts: dict[str, tuple[int | float, int | float]] = {
+            "goto": (5, 30),
+            "m3u8": (3, 20),
+            "process": (5, 45),
+        }
+
+        self.attempts: Counter[str] = Counter()
+
+        self.pools: dict[str, AdaptiveLimit] = {}
+
+        self.probed: dict[str, tuple[float, str]] = {}
+
+        self.mirrors = Mirrors(Path(__file__).parent.parent / "caches" / "mirrors.json")
+
+    def __reduce__(self) -> str:
+        return "network"
+
+    def pool(self, name: str, limit: int | None = None) -> AdaptiveLimit:
+        if not (pool := self.pools.get(name)):
+            pool = self.pools[name] = AdaptiveLimit(limit or 2, maximum=limit or 8)
+
+        elif limit:
+            pool.maximum = limit
+            pool.limit = min(pool.limit, limit)
+
+        return pool
+
+    def budget(self, key: str, default: int | float) -> float:
+        return self.latency.timeout(
+            key,
+            default,
+            *self.timeouts[key.partition(":")[0]],
         )
 
-        self._logger = get_logger("network")
+    def limits(self) -> dict[str, int]:
+        return {
+            **super().limits(),
+            **{f"browser: {name}": pool.current for name, pool in self.pools.items()},
+        }
+
+    def log_summary(self) -> None:
+        if parsed := offload.summary():
+            self._logger.info(parsed)
+
+        super().log_summary()
+
+    async def check_status(self, url: str, keep_body: bool = False) -> bool:
+        start = time.perf_counter()
 
-    async def check_status(self, url: str) -> bool:
         try:
-            r = await self.client.get(url)
-            r.raise_for_status()
-            return r.status_code == 200
+            async with self.client.stream(
+                "GET",
+                url,
+                extensions={"coalesce": keep_body},
+            ) as r:
+                r.raise_for_status()
+                ok = r.status_code == 200
+
+                if ok and keep_body:
+                    await r.aread()
+                    self.probed[url] = (time.monotonic(), r.text)
         except (httpx.HTTPError, httpx.TimeoutException) as e:
             self._logger.debug(f"Status check failed for {url}: {e}")
-            return False
+            ok = False
+
+        self.mirrors.record(url, time.perf_counter() - start if ok else None)
+
+        return ok
+
+    async def scan(
+        self,
+        url: str,
+        pattern: re.Pattern[str],
+        overlap: int = 1_024,
+        max_bytes: int = 2_097_152,
+        **kwargs,
+    ) -> re.Match[str] | None:
+
+        tail = ""
+
+        async with self.client.stream(
+            "GET",
+            url,
+            extensions={"host_class": "page", "coalesce": False},
+            **kwargs,
+        ) as r:
+            r.raise_for_status()
 
-    async def get_base(self, mirrors: list[str]) -> str | None:
-        tasks = [self.check_status(link) for link in mirrors]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            async for chunk in r.aiter_text():
+                buffer = tail + chunk
 
-        working_mirrors = [
-            mirror for mirror, success in zip(mirrors, results) if success
-        ]
+                if (match := pattern.search(buffer)) and match.end() < len(buffer):
+                    return match
 
-        return working_mirrors[0] if working_mirrors else None
+                tail = buffer[match.start() if match else -overlap :]
+
+                if r.num_bytes_downloaded > max_bytes:
+                    self._logger.warning(
+                        f'Stopped reading "{url}" after {r.num_bytes_downloaded} bytes'
+                    )
+
+                    return None
+
+        return pattern.search(tail)
+
+    def probed_body(self, url: str, ttl: int | float = 60) -> str | None:
+        if (probed := self.probed.pop(url, None)) and (
+            time.monotonic() - probed[0] < ttl
+        ):
+            return probed[1]
+
+    async def get_base(
+        self,
+        mirrors: list[str],
+        keep_body: bool = False,
+    ) -> str | None:
+
+        queue = self.mirrors.order(mirrors)
+
+        tasks: dict[asyncio.Task, str] = {}
+
+        try:
+            while queue or tasks:
+                if queue:
+                    url = queue.pop(0)
+                    tasks[asyncio.create_task(self.check_status(url, keep_body))] = url
+
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self.mirrors.stagger if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    if (url := tasks.pop(task)) and task.result():
+                        for other in mirrors:
+                            if other != url:
+                                self.probed.pop(other, None)
+
+                        return url
+
+            return None
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def alternates(self, base_url: str, mirrors: list[str]) -> list[str]:
+        return [base_url, *self.mirrors.order([m for m in mirrors if m != base_url])]
 
-    @staticmethod
     async def safe_process(
+        self,
         fn: Callable[[], Awaitable[T]],
         url_num: int,
         timeout: int | float = 15,
@@ -60,11 +187,38 @@ class Network:
         if not log:
             log = logging.getLogger(__name__)
 
-        task = asyncio.create_task(fn())
+        if url := getattr(fn, "keywords", {}).get("url"):
+            host = urlsplit(url).hostname
+        else:
+            host = None
+
+        if host and not self.breaker.allow(host):
+            log.warning(f"URL {url_num}) Circuit open for {host}, skipping event")
+            return None
+
+        self.attempts[log.name] += 1
+
+        pool = self.pool(log.name)
+
+        timeout = self.budget(f"process:{log.name}", timeout)
+
+        async def guarded() -> T:
+            if host:
+                self.breaker.probe.set(host)
+
+            return await fn()
+
+        await pool.acquire()
 
         try:
-            return await asyncio.wait_for(task, timeout=timeout)
+            start = time.perf_counter()
+
+            task = asyncio.create_task(guarded())
+
+            result = await asyncio.wait_for(task, timeout=timeout)
         except asyncio.TimeoutError:
+            pool.release(overloaded=True)
+
             log.warning(f"URL {url_num}) Timed out after {timeout}s, skipping event")
 
             task.cancel()
@@ -76,11 +230,64 @@ class Network:
             except Exception as e:
                 log.debug(f"URL {url_num}) Ignore exception after timeout: {e}")
 
+            if host:
+                self.breaker.failure(host)
+
             return None
+        except asyncio.CancelledError:
+            pool.discard()
+
+            if host:
+                self.breaker.probing.discard(host)
+
+            raise
         except Exception as e:
+            pool.release(ok=False)
+
             log.error(f"URL {url_num}) Unexpected error: {e}")
+
+            if host:
+                self.breaker.failure(host)
+
             return None
 
+        pool.release(elapsed := time.perf_counter() - start)
+
+        self.latency.record(f"process:{log.name}", elapsed)
+
+        if host:
+            if result[-1] if isinstance(result, tuple) else result:
+                self.breaker.success(host)
+            else:
+                self.breaker.failure(host)
+
+        return result
+
+    async def extract(
+        self,
+        events: list[dict[str, Any]],
+        fn: Callable[..., Awaitable[T]],
+        context: Callable[[], Awaitable[BrowserContext]],
+        log: logging.Logger,
+        workers: int = 4,
+    ) -> list[T | None]:
+
+        self.pool(log.name, workers)
+
+        async def call(url: str, url_num: int) -> T:
+            return await fn(url=url, url_num=url_num, context=await context())
+
+        async def run(i: int, ev: dict[str, Any]) -> T | None:
+            return await self.safe_process(
+                partial(call, url=ev["link"], url_num=i),
+                url_num=i,
+                log=log,
+            )
+
+        return await asyncio.gather(
+            *(run(i, ev) for i, ev in enumerate(events, start=1))
+        )
+
     @staticmethod
     def capture_req(
         req: Request,
@@ -101,6 +308,34 @@ class Network:
             captured.append(req.url)
             got_one.set()
 
+    async def goto(self, page: Page, url: str) -> None:
+        key = f"goto:{urlsplit(url).hostname}"
+
+        start = time.perf_counter()
+
+        await page.goto(
+            url,
+            wait_until="domcontentloaded",
+            timeout=self.budget(key, 15) * 1_000,
+        )
+
+        self.latency.record(key, time.perf_counter() - start)
+
+    async def wait_m3u8(
+        self,
+        url: str,
+        got_one: asyncio.Event,
+        timeout: int | float,
+    ) -> None:
+
+        key = f"m3u8:{urlsplit(url).hostname}"
+
+        start = time.perf_counter()
+
+        await asyncio.wait_for(got_one.wait(), timeout=self.budget(key, timeout))
+
+        self.latency.record(key, time.perf_counter() - start)
+
     async def process_event(
         self,
         url: str,
@@ -125,29 +360,14 @@ class Network:
         page.on("request", handler)
 
         try:
-            await page.goto(
-                url,
-                wait_until="domcontentloaded",
-                timeout=15_000,
-            )
-
-            wait_task = asyncio.create_task(got_one.wait())
+            await self.goto(page, url)
 
             try:
-                await asyncio.wait_for(wait_task, timeout=timeout)
+                await self.wait_m3u8(url, got_one, timeout)
             except asyncio.TimeoutError:
                 log.warning(f"URL {url_num}) Timed out waiting for M3U8.")
                 return
 
-            finally:
-                if not wait_task.done():
-                    wait_task.cancel()
-
-                    try:
-                        await wait_task
-                    except asyncio.CancelledError:
-                        pass
-
             if captured:
                 log.info(f"URL {url_num}) Captured M3U8")
                 return captured[0]
@@ -163,89 +383,6 @@ class Network:
             page.remove_listener("request", handler)
             await page.close()
 
-    @staticmethod
-    async def browser(
-        playwright: Playwright,
-        browser: str = "firefox",
-        ignore_https_errors: bool = False,
-    ) -> tuple[Browser, BrowserContext]:
-
-        if browser == "brave":
-            brwsr = await playwright.chromium.connect_over_cdp("http://localhost:9222")
-            context = brwsr.contexts[0]
-        else:
-            brwsr = await playwright.firefox.launch(headless=True)
-
-            context = await brwsr.new_context(
-                user_agent=Network.UA,
-                ignore_https_errors=ignore_https_errors,
-                viewport={"width": 1366, "height": 768},
-                device_scale_factor=1,
-                locale="en-US",
-                timezone_id="America/New_York",
-                color_scheme="dark",
-                permissions=["geolocation"],
-                extra_http_headers={
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Upgrade-Insecure-Requests": "1",
-                },
-            )
-
-            await context.add_init_script(
-                """
-            Object.defineProperty(navigator, "webdriver", { get: () => undefined });
-
-            Object.defineProperty(navigator, "languages", {
-            get: () => ["en-US", "en"],
-            });
-
-            Object.defineProperty(navigator, "plugins", {
-            get: () => [1, 2, 3, 4],
-            });
-
-            const elementDescriptor = Object.getOwnPropertyDescriptor(
-            HTMLElement.prototype,
-            "offsetHeight"
-            );
-
-            Object.defineProperty(HTMLDivElement.prototype, "offsetHeight", {
-            ...elementDescriptor,
-            get: function () {
-                if (this.id === "modernizr") {
-                return 24;
-                }
-                return elementDescriptor.get.apply(this);
-            },
-            });
-
-            Object.defineProperty(window.screen, "width", { get: () => 1366 });
-            Object.defineProperty(window.screen, "height", { get: () => 768 });
-
-            const getParameter = WebGLRenderingContext.prototype.getParameter;
-
-            WebGLRenderingContext.prototype.getParameter = function (param) {
-            if (param === 37445) return "Intel Inc."; //  UNMASKED_VENDOR_WEBGL
-            if (param === 37446) return "Intel Iris OpenGL    Engine"; // UNMASKED_RENDERER_WEBGL
-            return getParameter.apply(this, [param]);
-            };
-
-            const observer = new MutationObserver((mutations) => {
-            mutations.forEach((mutation) => {
-                mutation.addedNodes.forEach((node) => {
-                if (node.tagName === "IFRAME" && node.hasAttribute("sandbox")) {
-                    node.removeAttribute("sandbox");
-                }
-                });
-            });
-            });
-
-            observer.observe(document.documentElement, { childList: true, subtree: true });
-
-            """
-            )
-
-        return brwsr, context
-
 
 network = Network()
 
@@ -0,0 +1,341 @@
+import asyncio
+import importlib
+import json
+import os
+import socket
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from httpstack import get_logger
+
+from .browsers import browsers
+from .config import Time
+from .resolver import resolver
+from .webwork import network
+
+log = get_logger("workqueue")
+
+
+class WorkQueue:
+    def __init__(
+        self,
+        file: Path,
+        lease: int | float = 900,
+        max_attempts: int = 3,
+    ) -> None:
+
+        self.file = file
+        self.lease = lease
+        self.max_attempts = max_attempts
+
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as db:
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY,
+                    run INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    payload BLOB,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    claimed_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE INDEX IF NOT EXISTS items_run_state ON items (run, state);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.file, timeout=30, isolation_level=None)
+
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            yield db
+        finally:
+            db.close()
+
+    def shard_dir(self, run: int) -> Path:
+        return self.file.parent / "shards" / str(run)
+
+    def latest_run(self) -> int | None:
+        with self._connect() as db:
+            row = db.execute("SELECT MAX(run) FROM items").fetchone()
+
+        return row[0]
+
+    def start_run(self, providers: list[str]) -> int:
+        run = int(Time.now().timestamp())
+
+        with self._connect() as db:
+            db.executemany(
+                "INSERT INTO items (run, kind, provider) VALUES (?, 'provider', ?)",
+                [(run, provider) for provider in providers],
+            )
+
+        return run
+
+    def enqueue(
+        self,
+        run: int,
+        kind: str,
+        provider: str,
+        payload: bytes | None = None,
+    ) -> None:
+
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO items (run, kind, provider, payload) VALUES (?, ?, ?, ?)",
+                (run, kind, provider, payload),
+            )
+
+    def claim(self, run: int, worker: str) -> tuple[int, str, str, bytes] | None:
+        now = Time.now().timestamp()
+
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+
+            row = db.execute(
+                """
+                SELECT id, kind, provider, payload FROM items
+                WHERE run = ? AND attempts < ? AND (
+                    state = 'pending' OR (state = 'claimed' AND claimed_at < ?)
+                )
+                ORDER BY kind = 'provider' DESC, id
+                LIMIT 1
+                """,
+                (run, self.max_attempts, now - self.lease),
+            ).fetchone()
+
+            if row:
+                db.execute(
+                    """
+                    UPDATE items
+                    SET state = 'claimed', worker = ?, claimed_at = ?,
+                        attempts = attempts + 1
+                    WHERE id = ?
+                    """,
+                    (worker, now, row[0]),
+                )
+
+            db.execute("COMMIT")
+
+        return row
+
+    def finish(self, item_id: int, ok: bool = True) -> None:
+        with self._connect() as db:
+            db.execute(
+                "UPDATE items SET state = ? WHERE id = ?",
+                ("done" if ok else "pending", item_id),
+            )
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+
+            try:
+                yield
+            finally:
+                db.execute("COMMIT")
+
+    def outstanding(self, run: int) -> int:
+        with self._connect() as db:
+            row = db.execute(
+                """
+                SELECT COUNT(*) FROM items
+                WHERE run = ? AND state != 'done' AND attempts < ?
+                """,
+                (run, self.max_attempts),
+            ).fetchone()
+
+        return row[0]
+
+    def failed(self, run: int) -> int:
+        with self._connect() as db:
+            row = db.execute(
+                """
+                SELECT COUNT(*) FROM items
+                WHERE run = ? AND state != 'done' AND attempts >= ?
+                """,
+                (run, self.max_attempts),
+            ).fetchone()
+
+        return row[0]
+
+
+def write_shard(
+    shard_dir: Path,
+    provider: str,
+    worker: str,
+    entries: dict[str, dict[str, Any]],
+) -> None:
+
+    if not entries:
+        return
+
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    with (shard_dir / f"{provider.rsplit('.', 1)[-1]}.{worker}.jsonl").open(
+        "a",
+        encoding="utf-8",
+    ) as f:
+        for key, entry in entries.items():
+            f.write(json.dumps({"key": key, **entry}, ensure_ascii=False) + "\n")
+
+
+def reduce_shards(shard_dir: Path) -> dict[str, dict[str, Any]]:
+    merged: dict[str, dict[str, Any]] = {}
+
+    for file in sorted(shard_dir.glob("*.jsonl")):
+        for line in file.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+
+            entry: dict[str, Any] = json.loads(line)
+
+            key = entry.pop("key")
+
+            if not entry.get("url"):
+                continue
+
+            if (current := merged.get(key)) and (
+                current.get("timestamp", 0),
+                current["url"],
+            ) >= (entry.get("timestamp", 0), entry["url"]):
+                continue
+
+            merged[key] = entry
+
+    return dict(sorted(merged.items()))
+
+
+async def _run_provider(
+    queue: WorkQueue,
+    run: int,
+    worker: str,
+    provider: str,
+) -> None:
+
+    mod = importlib.import_module(provider)
+
+    mod.urls.clear()
+    resolver.jobs.clear()
+
+    await mod.scrape(network.client)
+
+    ready = {}
+
+    for i, (key, entry) in enumerate(mod.urls.items(), start=1):
+        if resolver.token(key) in resolver.jobs:
+            queue.enqueue(
+                run,
+                "event",
+                provider,
+                json.dumps({"key": key, "entry": entry, "url_num": i}).encode(),
+            )
+        else:
+            ready[key] = entry
+
+    write_shard(queue.shard_dir(run), provider, worker, ready)
+
+
+async def _run_event(
+    queue: WorkQueue,
+    run: int,
+    worker: str,
+    provider: str,
+    payload: bytes,
+) -> None:
+
+    mod = importlib.import_module(provider)
+
+    item: dict[str, Any] = json.loads(payload)
+
+    mod.defer(item["key"], item["entry"], item["url_num"])
+
+    token = resolver.token(item["key"])
+
+    if not (url := await resolver.resolve(token)):
+        return
+
+    resolved = {item["key"]: {**item["entry"], "url": url}}
+
+    write_shard(queue.shard_dir(run), provider, worker, resolved)
+
+    with queue.lock():
+        mod.CACHE_FILE.write({**mod.CACHE_FILE.load(), **resolved})
+
+
+async def work(queue: WorkQueue, run: int | None = None) -> None:
+    if not (run := run or queue.latest_run()):
+        log.warning("No runs queued")
+        return
+
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+
+    resolver.enabled = True
+
+    log.info(f"Worker {worker} joined run {run}")
+
+    try:
+        while True:
+            if not (item := queue.claim(run, worker)):
+                if not queue.outstanding(run):
+                    break
+
+                await asyncio.sleep(2)
+                continue
+
+            item_id, kind, provider, payload = item
+
+            log.info(f"Claimed {kind} item {item_id} ({provider})")
+
+            try:
+                if kind == "provider":
+                    await _run_provider(queue, run, worker, provider)
+                else:
+                    await _run_event(queue, run, worker, provider, payload)
+
+            except Exception as e:
+                log.error(f"Item {item_id} ({provider}) failed: {e}")
+                queue.finish(item_id, ok=False)
+
+            else:
+                queue.finish(item_id)
+
+    finally:
+        await resolver.close()
+
+        await browsers.close()
+
+        network.mirrors.save()
+
+        network.latency.save()
+
+    log.info(f"Worker {worker} finished run {run}")
+
+
+async def drain(queue: WorkQueue, run: int, timeout: int | float = 600) -> None:
+    deadline = Time.now().timestamp() + timeout
+
+    while (pending := queue.outstanding(run)) and Time.now().timestamp() < deadline:
+        await asyncio.sleep(2)
+
+    if pending:
+        log.warning(f"Merging run {run} with {pending} item(s) still outstanding")
+
+    if failed := queue.failed(run):
+        log.warning(
+            f"{failed} item(s) in run {run} failed after {queue.max_attempts} attempt(s)"
+        )
+
+
+__all__ = ["WorkQueue", "drain", "reduce_shards", "work", "write_shard"]
@@ -7,18 +7,27 @@ from typing import Any
 from urllib.parse import urljoin
 
 import httpx
-from playwright.async_api import BrowserContext, async_playwright
-
-from .utils import Cache, Time, get_logger, leagues, network
+from playwright.async_api import BrowserContext
+
+from .utils import (
+    Cache,
+    Time,
+    browsers,
+    get_logger,
+    leagues,
+    network,
+    offload,
+    resolver,
+)
 
 log = get_logger(__name__)
 
 urls: dict[str, dict[str, str | float]] = {}
 
-API_FILE = Cache(Path(__file__).parent / "caches" / "watchfty_api.json", exp=28_800)
-
 CACHE_FILE = Cache(Path(__file__).parent / "caches" / "watchfty.json", exp=10_800)
 
+PAGE_WORKERS = 4
+
 MIRRORS = [
     "https://www.watchfooty.cc",
     "https://www.watchfooty.vip",
@@ -36,42 +45,38 @@ SPORT_ENDPOINTS = [
     "golf",
 ]
 
+API_TTL = 28_800
+
+WINDOW = 1_800
+
 
-async def get_api_data(client: httpx.AsyncClient, url: str) -> list[dict[str, Any]]:
+async def get_api_data(urls: list[str]) -> list[dict[str, Any]]:
     try:
-        r = await client.get(url, timeout=10)
+        r = await network.hedged_get(
+            urls,
+            extensions={"cache": API_TTL, "host_class": "api"},
+        )
         r.raise_for_status()
     except Exception as e:
-        log.error(f'Failed to fetch "{url}": {e}')
+        log.error(f'Failed to fetch "{urls[0]}": {e}')
         return []
 
-    return r.json()
+    return await offload.json(r.content)
 
 
-async def refresh_api_cache(
-    client: httpx.AsyncClient,
-    url: str,
-) -> list[dict[str, Any]]:
-    log.info("Refreshing API cache")
+async def get_matches(base_url: str) -> list[dict[str, Any]]:
+    mirrors = network.alternates(base_url, MIRRORS)
 
     tasks = [
         get_api_data(
-            client,
-            urljoin(url, f"api/v1/matches/{sport}"),
+            [urljoin(mirror, f"api/v1/matches/{sport}") for mirror in mirrors],
         )
         for sport in SPORT_ENDPOINTS
     ]
 
     results = await asyncio.gather(*tasks)
 
-    data = list(chain(*results))
-
-    for ev in data:
-        ev["ts"] = ev.pop("timestamp")
-
-    data[-1]["timestamp"] = Time.now().timestamp()
-
-    return data
+    return list(chain(*results))
 
 
 async def process_event(
@@ -90,11 +95,7 @@ async def process_event(
     page.on("request", handler)
 
     try:
-        await page.goto(
-            url,
-            wait_until="domcontentloaded",
-            timeout=15_000,
-        )
+        await network.goto(page, url)
 
         try:
             header = await page.wait_for_selector(
@@ -113,23 +114,12 @@ async def process_event(
             log.warning(f"URL {url_num}) No available stream links.")
             return
 
-        wait_task = asyncio.create_task(got_one.wait())
-
         try:
-            await asyncio.wait_for(wait_task, timeout=6)
+            await network.wait_m3u8(url, got_one, 6)
         except asyncio.TimeoutError:
             log.warning(f"URL {url_num}) Timed out waiting for M3U8.")
             return
 
-        finally:
-            if not wait_task.done():
-                wait_task.cancel()
-
-                try:
-                    await wait_task
-                except asyncio.CancelledError:
-                    pass
-
         if captured:
             log.info(f"URL {url_num}) Captured M3U8")
             return captured[-1]
@@ -146,22 +136,42 @@ async def process_event(
         await page.close()
 
 
+def event_times() -> list[float]:
+    for base_url in MIRRORS:
+        api_data = list(
+            chain.from_iterable(
+                network.cache.peek_json(
+                    urljoin(base_url, f"api/v1/matches/{sport}"),
+                    API_TTL,
+                )
+                or []
+                for sport in SPORT_ENDPOINTS
+            )
+        )
+
+        if api_data:
+            return [
+                int(str(ts)[:-3])
+                for event in api_data
+                if (ts := event.get("timestamp"))
+            ]
+
+    return []
+
+
 async def get_events(
     client: httpx.AsyncClient,
     base_url: str,
     cached_keys: set[str],
 ) -> list[dict[str, str]]:
 
-    if not (api_data := API_FILE.load(per_entry=False, index=-1)):
-        api_data = await refresh_api_cache(client, base_url)
-
-        API_FILE.write(api_data)
+    api_data = await get_matches(base_url)
 
     events: list[dict[str, str]] = []
 
     now = Time.clean(Time.now())
     start_dt = now.delta(minutes=-30)
-    end_dt = now.delta(minutes=30)
+    end_dt = now.delta(seconds=WINDOW)
     pattern = re.compile(r"\-+|\(")
 
     for event in api_data:
@@ -169,7 +179,7 @@ async def get_events(
         name = event["title"]
         league = event["league"]
 
-        if not (ts := event.get("ts")):
+        if not (ts := event.get("timestamp")):
             continue
 
         start_ts = int(str(ts)[:-3])
@@ -201,17 +211,32 @@ async def get_events(
     return events
 
 
+def defer(key: str, entry: dict[str, Any], url_num: int) -> dict[str, Any]:
+    return resolver.add(
+        key,
+        entry,
+        partial(
+            process_event,
+            url=entry["link"],
+            url_num=url_num,
+        ),
+        browser="firefox",
+    )
+
+
 async def scrape(client: httpx.AsyncClient) -> None:
-    cached_urls = CACHE_FILE.load()
+    cached_urls = await CACHE_FILE.aload()
+    deferred = resolver.restore(cached_urls, defer)
     valid_urls = {k: v for k, v in cached_urls.items() if v["url"]}
     valid_count = cached_count = len(valid_urls)
     urls.update(valid_urls)
+    urls.update(deferred)
 
     log.info(f"Loaded {cached_count} event(s) from cache")
 
     if not (base_url := await network.get_base(MIRRORS)):
         log.warning("No working WatchFooty mirrors")
-        CACHE_FILE.write(cached_urls)
+        await CACHE_FILE.awrite(cached_urls)
         return
 
     log.info(f'Scraping from "{base_url}"')
@@ -224,24 +249,44 @@ async def scrape(client: httpx.AsyncClient) -> None:
 
     log.info(f"Processing {len(events)} new URL(s)")
 
-    if events:
-        async with async_playwright() as p:
-            browser, context = await network.browser(p)
+    if events and resolver.enabled:
+        for i, ev in enumerate(events, start=1):
+            sport, event, logo, ts = (
+                ev["sport"],
+                ev["event"],
+                ev["logo"],
+                ev["timestamp"],
+            )
 
-            for i, ev in enumerate(events, start=1):
-                handler = partial(
-                    process_event,
-                    url=ev["link"],
-                    url_num=i,
-                    context=context,
-                )
+            key = f"[{sport}] {event} (WFTY)"
 
-                url = await network.safe_process(
-                    handler,
-                    url_num=i,
-                    log=log,
-                )
+            tvg_id, pic = leagues.get_tvg_info(sport, event)
+
+            entry = {
+                "logo": logo or pic,
+                "base": base_url,
+                "timestamp": ts,
+                "id": tvg_id or "Live.Event.us",
+                "link": ev["link"],
+            }
+
+            urls[key] = defer(key, entry, i)
+
+            cached_urls[key] = resolver.placeholder(entry)
 
+        log.info(f"Deferred {len(events)} event(s) for on-demand resolution")
+
+    elif events:
+        async with browsers.lease() as lease:
+            results = await network.extract(
+                events,
+                process_event,
+                lease.context,
+                log=log,
+                workers=PAGE_WORKERS,
+            )
+
+            for ev, url in zip(events, results):
                 sport, event, logo, ts = (
                     ev["sport"],
                     ev["event"],
@@ -267,11 +312,9 @@ async def scrape(client: httpx.AsyncClient) -> None:
                     valid_count += 1
                     urls[key] = entry
 
-            await browser.close()
-
     if new_count := valid_count - cached_count:
         log.info(f"Collected and cached {new_count} new event(s)")
     else:
         log.info("No new events found")
 
-    CACHE_FILE.write(cached_urls)
+    await CACHE_FILE.awrite(cached_urls)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+import asyncio
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from httpstack import HTTPStack, get_logger
+
+log = get_logger("health")
+
+network = HTTPStack(domains={"nocable.cc": (3, 3)}, verify=False)
+
+BASE_FILE = Path(__file__).parent / "M3U8" / "base.m3u8"
+
+README = Path(__file__).parent / "readme.md"
+
+MAX_JOBS = 50
+
+HEADERS = {
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+LINKS = {
+    "Base Channels URL": "https://s.id/d9Base",
+    "Live Events URL": "https://s.id/d9Live",
+    "Combined (Base + Live Events) URL": "https://s.id/d9M3U8",
+    "EPG URL": "https://s.id/d9EPG",
+}
+
+DISCLAIMER = """\
+#### Legal Disclaimer
+This repository lists publicly accessible IPTV streams as found on the internet at the time of checking.
+No video or audio content is hosted in this repository. These links may point to copyrighted material owned by third parties;
+they are provided **solely for educational and research purposes.**
+The author does not endorse, promote, or encourage illegal streaming or copyright infringement.
+End users are solely responsible for ensuring they comply with all applicable laws in their jurisdiction before using any link in this repository.
+If you are a rights holder and wish for a link to be removed, please open an issue.
+"""
+
+
+def load_channels() -> list[tuple[str, str]]:
+    channels: list[tuple[str, str]] = []
+
+    name = ""
+
+    for line in BASE_FILE.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+
+        if line.startswith("#EXTINF"):
+            name = m[1] if (m := re.search(r'tvg-name="([^"]*)"', line)) else ""
+
+        elif re.match(r"https?://", line):
+            channels.append((name or f"Channel {len(channels)}", line))
+
+    return channels
+
+
+async def get_status(url: str, sem: asyncio.Semaphore) -> str | None:
+    async with sem:
+        try:
+            async with network.client.stream(
+                "GET",
+                url,
+                headers=HEADERS,
+                timeout=15,
+                extensions={"coalesce": False, "breaker": False},
+            ) as r:
+                status_code = r.status_code
+        except httpx.TimeoutException:
+            return "Connection timed out"
+        except httpx.HTTPError:
+            return "Connection error"
+
+    if status_code == 200:
+        return None
+
+    if status_code >= 400:
+        return f"HTTP Error ({status_code})"
+
+    return f"Unknown status ({status_code})"
+
+
+async def check_links() -> tuple[int, int, list[str]]:
+    log.info(f"Checking links from: {BASE_FILE}")
+
+    channels = load_channels()
+
+    sem = asyncio.Semaphore(MAX_JOBS)
+
+    results = await asyncio.gather(*(get_status(url, sem) for _, url in channels))
+
+    failures = sorted(
+        {
+            f"| {name} | {error} | `{url}` |"
+            for (name, url), error in zip(channels, results)
+            if error
+        }
+    )
+
+    failed = sum(1 for error in results if error)
+
+    log.info("Done.")
+
+    return len(channels) - failed, failed, failures
+
+
+def write_readme(passed: int, failed: int, failures: list[str]) -> None:
+    now = datetime.now(timezone.utc)
+
+    lines = [
+        f"## Base Log @ {now:%Y-%m-%d %H:%M} UTC",
+        "",
+        f"### ✅ Working Streams: {passed}<br>❌ Dead Streams: {failed}",
+        "",
+    ]
+
+    if failures:
+        lines += [
+            "| Channel | Error (Code) | Link |",
+            "| ------- | ------------ | ---- |",
+            *failures,
+        ]
+
+    lines.append("---")
+
+    for title, link in LINKS.items():
+        lines += [f"#### {title}", "```", link, "```"]
+
+    lines.append("---")
+
+    README.write_text("\n".join(lines) + "\n" + DISCLAIMER, encoding="utf-8")
+
+
+async def main() -> None:
+    write_readme(*await check_links())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+    try:
+        asyncio.run(network.client.aclose())
+    except Exception:
+        pass
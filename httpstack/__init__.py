@@ -0,0 +1,4 @@
+from .client import HTTPStack
+from .logger import get_logger
+
+__all__ = ["HTTPStack", "get_logger"]
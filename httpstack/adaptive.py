@@ -0,0 +1,127 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+
+
+class AdaptiveLimit:
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        tolerance: float = 1.5,
+        max_errors: float = 0.1,
+        backoff: float = 0.5,
+    ) -> None:
+
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.max_errors = max_errors
+        self.backoff = backoff
+
+        self.inflight = 0
+        self.baseline: float | None = None
+        self.decreased = 0.0
+
+        self._latencies: list[float] = []
+        self._outcomes: list[bool] = []
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def current(self) -> int:
+        return max(int(self.limit), self.minimum)
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < self.current:
+            if not (waiter := self._waiters.popleft()).done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    async def acquire(self) -> None:
+        if self.inflight < self.current and not self._waiters:
+            self.inflight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+
+        self._waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.inflight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+
+            raise
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+
+        if now - self.decreased < max(self.baseline or 0, 1):
+            return
+
+        self.limit = max(self.limit * self.backoff, self.minimum)
+        self.decreased = now
+
+    def _adjust(self) -> None:
+        if len(self._outcomes) < self.current:
+            return
+
+        errors = self._outcomes.count(False) / len(self._outcomes)
+
+        p50 = statistics.median(self._latencies) if self._latencies else None
+
+        self._latencies.clear()
+        self._outcomes.clear()
+
+        if errors > self.max_errors:
+            self._decrease()
+            return
+
+        if p50 is None:
+            return
+
+        if self.baseline is None or p50 < self.baseline:
+            self.baseline = p50
+
+        if p50 <= self.baseline * self.tolerance:
+            self.limit = min(self.limit + 1, self.maximum)
+        else:
+            self.limit = max(self.limit * 0.9, self.minimum)
+            self.baseline = self.baseline * 0.95 + p50 * 0.05
+
+    def release(
+        self,
+        latency: float | None = None,
+        ok: bool = True,
+        overloaded: bool = False,
+    ) -> None:
+
+        self.inflight -= 1
+
+        if overloaded:
+            self._decrease()
+
+        else:
+            if latency is not None:
+                self._latencies.append(latency)
+
+            self._outcomes.append(ok)
+
+            self._adjust()
+
+        self._wake()
+
+    def discard(self) -> None:
+        self.inflight -= 1
+
+        self._wake()
+
+
+__all__ = ["AdaptiveLimit"]
@@ -0,0 +1,67 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from .logger import get_logger
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, cooldown: int | float = 300) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+        self.failures: Counter[str] = Counter()
+        self.rejected: Counter[str] = Counter()
+        self.opened: dict[str, float] = {}
+        self.probing: set[str] = set()
+        self.probe: ContextVar[str | None] = ContextVar("probe", default=None)
+
+        self._logger = get_logger("breaker")
+
+    def allow(self, host: str) -> bool:
+        if host not in self.opened:
+            return True
+
+        if host in self.probing and self.probe.get() == host:
+            return True
+
+        if time.monotonic() - self.opened[host] < self.cooldown or host in self.probing:
+            self.rejected[host] += 1
+            return False
+
+        self.probing.add(host)
+
+        return True
+
+    def success(self, host: str) -> None:
+        if self.opened.pop(host, None) is not None:
+            self._logger.info(f"Circuit closed for {host}")
+
+        self.failures.pop(host, None)
+        self.probing.discard(host)
+
+    def failure(self, host: str) -> None:
+        self.failures[host] += 1
+
+        if host in self.probing or (
+            host not in self.opened and self.failures[host] >= self.threshold
+        ):
+            self._logger.warning(
+                f"Circuit open for {host} after {self.failures[host]} failure(s)"
+            )
+
+            self.opened[host] = time.monotonic()
+
+        self.probing.discard(host)
+
+    def summary(self) -> str | None:
+        if not self.opened:
+            return None
+
+        return "Open circuits: " + ", ".join(
+            f"{host} ({self.failures[host]} failed, {self.rejected[host]} skipped)"
+            for host in sorted(self.opened)
+        )
+
+
+__all__ = ["CircuitBreaker"]
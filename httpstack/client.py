@@ -0,0 +1,223 @@
+import asyncio
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+from .breaker import CircuitBreaker
+from .dns import CachingBackend, DNSCache, install
+from .httpcache import CachingTransport, HTTPCache
+from .latency import LatencyTracker
+from .logger import get_logger
+from .ratelimit import RateLimiter
+from .timing import RequestTimer
+from .transport import CoalescingTransport, HostTransport
+
+
+class HTTPStack:
+    UA = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/134.0.0.0 Safari/537.36 Edg/134.0.0.0"
+    )
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        domains: dict[str, tuple[int | float, int | float]] | None = None,
+        verify: bool = True,
+    ) -> None:
+
+        self._logger = get_logger("network")
+
+        self.breaker = CircuitBreaker()
+
+        self.limiter = RateLimiter(domains=domains)
+
+        self.latency = LatencyTracker(cache_dir / "latency.json" if cache_dir else None)
+
+        self.hedge_after = 2.0
+        self.hedge_budget = 0.1
+        self.hedges: Counter[str] = Counter()
+
+        self.dns = DNSCache()
+
+        self.timer = RequestTimer()
+
+        self.http = httpx.AsyncHTTPTransport(
+            verify=verify,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=50,
+            ),
+        )
+
+        if not install(self.http, CachingBackend(self.dns, on_resolve=self.timer.dns)):
+            self._logger.warning("DNS cache disabled: unsupported httpx transport")
+
+        self.hosts = HostTransport(
+            self.http,
+            breaker=self.breaker,
+            limiter=self.limiter,
+            latency=self.latency,
+        )
+
+        self.cache = HTTPCache(cache_dir / "http") if cache_dir else None
+
+        self.coalescer = CoalescingTransport(
+            CachingTransport(self.hosts, self.cache) if self.cache else self.hosts
+        )
+
+        self.client = httpx.AsyncClient(
+            timeout=5,
+            follow_redirects=True,
+            headers={"User-Agent": self.UA},
+            transport=self.coalescer,
+            event_hooks=self.timer.hooks,
+        )
+
+    def limits(self) -> dict[str, int]:
+        return {
+            f"{host} ({host_class or 'default'})": slot.current
+            for (host, host_class), slot in self.hosts.slots.items()
+        }
+
+    def log_summary(self) -> None:
+        if summary := self.breaker.summary():
+            self._logger.warning(summary)
+
+        if saved := self.coalescer.stats["coalesced"]:
+            self._logger.info(
+                f"Coalesced {saved} of {self.coalescer.stats['requests']} GET request(s)"
+            )
+
+        if lookups := self.dns.stats["lookups"]:
+            self._logger.debug(
+                f"DNS cache: {lookups} lookup(s), {self.dns.stats['hits']} hit(s)"
+            )
+
+        if hedged := self.hedges["hedged"]:
+            self._logger.info(
+                f"Hedged {hedged} of {self.hedges['requests']} request(s), "
+                f"{self.hedges['won']} answered first"
+            )
+
+        self.timer.log_summary()
+
+        if limits := self.limits():
+            self._logger.info(
+                "Concurrency limits: "
+                + ", ".join(f"{name}={limit}" for name, limit in sorted(limits.items()))
+            )
+
+    async def prewarm(self, urls: list[str], timeout: int | float = 3) -> None:
+        origins = {
+            f"{parts.scheme}://{parts.netloc}"
+            for url in urls
+            if (parts := urlsplit(url)).scheme in ("http", "https")
+        }
+
+        if not origins:
+            return
+
+        async def connect(origin: str) -> None:
+            try:
+                r = await self.hosts.handle_async_request(
+                    httpx.Request(
+                        "HEAD",
+                        f"{origin}/",
+                        headers={"User-Agent": self.UA},
+                        extensions={
+                            "timeout": httpx.Timeout(timeout).as_dict(),
+                            "retries": 0,
+                        },
+                    )
+                )
+
+                await r.aclose()
+            except httpx.HTTPError as e:
+                self._logger.debug(f"Prewarm failed for {origin}: {e}")
+
+        start = time.perf_counter()
+
+        await asyncio.gather(*(connect(origin) for origin in origins))
+
+        self._logger.info(
+            f"Prewarmed {len(origins)} host(s) in {time.perf_counter() - start:.2f}s"
+        )
+
+    async def hedged_get(self, urls: str | list[str], **kwargs) -> httpx.Response:
+        urls = [urls] if isinstance(urls, str) else urls
+
+        primary, alternate = urls[0], urls[1] if len(urls) > 1 else urls[0]
+
+        delay = (
+            self.latency.percentile(urlsplit(primary).hostname, 95) or self.hedge_after
+        )
+
+        self.hedges["requests"] += 1
+
+        tasks = [asyncio.create_task(self.client.get(primary, **kwargs))]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+
+            if not done and self.hedges["hedged"] < max(
+                2,
+                self.hedges["requests"] * self.hedge_budget,
+            ):
+                self.hedges["hedged"] += 1
+
+                hedge_kwargs = {
+                    **kwargs,
+                    "extensions": {**kwargs.get("extensions", {}), "coalesce": False},
+                }
+
+                self._logger.debug(f'Hedging "{primary}" with "{alternate}"')
+
+                tasks.append(
+                    asyncio.create_task(self.client.get(alternate, **hedge_kwargs))
+                )
+
+            pending = set(tasks)
+
+            fallback: httpx.Response | None = None
+
+            error: BaseException | None = None
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    if task.exception():
+                        error = task.exception()
+                        continue
+
+                    if (r := task.result()).status_code >= 500:
+                        fallback = r
+                        continue
+
+                    if task is not tasks[0]:
+                        self.hedges["won"] += 1
+
+                    return r
+
+            if fallback:
+                return fallback
+
+            raise error
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["HTTPStack"]
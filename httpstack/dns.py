@@ -0,0 +1,153 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+import httpcore
+import httpx
+
+
+class DNSCache:
+    def __init__(self, ttl: int | float = 300) -> None:
+        self.ttl = ttl
+
+        self.entries: dict[str, tuple[float, list[str]]] = {}
+        self.stats: Counter[str] = Counter()
+
+        self._inflight: dict[str, asyncio.Future[list[str]]] = {}
+
+    @staticmethod
+    def is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return False
+
+        return True
+
+    def forget(self, host: str) -> None:
+        self.entries.pop(host, None)
+
+    async def _lookup(self, host: str, port: int) -> list[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host,
+            port,
+            type=socket.SOCK_STREAM,
+        )
+
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        if self.is_ip(host):
+            return [host]
+
+        if (entry := self.entries.get(host)) and entry[0] > time.monotonic():
+            self.stats["hits"] += 1
+            return entry[1]
+
+        if future := self._inflight.get(host):
+            self.stats["hits"] += 1
+        else:
+            self.stats["lookups"] += 1
+
+            future = self._inflight[host] = asyncio.ensure_future(
+                self._lookup(host, port)
+            )
+
+            future.add_done_callback(lambda f: self._done(host, f))
+
+        try:
+            return await asyncio.shield(future)
+        except OSError as e:
+            raise httpcore.ConnectError(f"DNS lookup failed for {host}: {e}") from e
+
+    def _done(self, host: str, future: asyncio.Future[list[str]]) -> None:
+        self._inflight.pop(host, None)
+
+        if not future.cancelled() and not future.exception():
+            self.entries[host] = (time.monotonic() + self.ttl, future.result())
+
+
+class CachingBackend(httpcore.AsyncNetworkBackend):
+    def __init__(
+        self,
+        dns: DNSCache,
+        backend: httpcore.AsyncNetworkBackend | None = None,
+        on_resolve: Callable[[float], None] | None = None,
+    ) -> None:
+
+        self.dns = dns
+        self.backend = backend or httpcore.AnyIOBackend()
+        self.on_resolve = on_resolve
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+
+        error: Exception | None = None
+
+        start = time.perf_counter()
+
+        addresses = await self.dns.resolve(host, port)
+
+        if self.on_resolve:
+            self.on_resolve(time.perf_counter() - start)
+
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+
+        self.dns.forget(host)
+
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+
+        return await self.backend.connect_unix_socket(
+            path,
+            timeout=timeout,
+            socket_options=socket_options,
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+def install(
+    transport: httpx.AsyncHTTPTransport,
+    backend: httpcore.AsyncNetworkBackend,
+) -> bool:
+
+    pool = getattr(transport, "_pool", None)
+
+    if not isinstance(pool, httpcore.AsyncConnectionPool) or not hasattr(
+        pool, "_network_backend"
+    ):
+        return False
+
+    pool._network_backend = backend
+
+    return True
+
+
+__all__ = ["CachingBackend", "DNSCache", "install"]
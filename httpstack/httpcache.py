@@ -0,0 +1,162 @@
+import gzip
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+
+class HTTPCache:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+        return self.cache_dir / f"{key}.gz"
+
+    def load(self, url: str) -> tuple[dict[str, Any], bytes] | None:
+        try:
+            data = gzip.decompress(self._path(url).read_bytes())
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+
+        meta, _, body = data.partition(b"\n")
+
+        try:
+            return json.loads(meta), body
+        except json.JSONDecodeError:
+            return None
+
+    def save(self, url: str, meta: dict[str, Any], body: bytes) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        path = self._path(url)
+
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(
+            gzip.compress(json.dumps(meta).encode("utf-8") + b"\n" + body, mtime=0)
+        )
+        tmp.replace(path)
+
+    def peek(self, url: str, max_age: int | float | None = None) -> bytes | None:
+        if not (cached := self.load(url)):
+            return None
+
+        meta, body = cached
+
+        if max_age is not None and meta["stored"] + max_age < time.time():
+            return None
+
+        return body
+
+    def peek_json(self, url: str, max_age: int | float | None = None) -> Any:
+        if (body := self.peek(url, max_age)) is None:
+            return None
+
+        return json.loads(body)
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, store: HTTPCache) -> None:
+        self.transport = transport
+        self.store = store
+
+    @staticmethod
+    def expires(headers: httpx.Headers, ttl: int | float, now: float) -> float | None:
+        directives = headers.get("cache-control", "").lower()
+
+        if "no-store" in directives:
+            return None
+
+        if "no-cache" in directives:
+            return now
+
+        if m := re.search(r"max-age=(\d+)", directives):
+            return now + int(m[1])
+
+        return now + ttl
+
+    def response(
+        self,
+        request: httpx.Request,
+        meta: dict[str, Any],
+        body: bytes,
+        from_cache: bool = True,
+    ) -> httpx.Response:
+
+        return httpx.Response(
+            meta["status"],
+            headers=meta["headers"],
+            content=body,
+            request=request,
+            extensions={"from_cache": from_cache},
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or (ttl := request.extensions.get("cache")) is None:
+            return await self.transport.handle_async_request(request)
+
+        url = str(request.url)
+
+        now = time.time()
+
+        if cached := self.store.load(url):
+            meta, body = cached
+
+            if meta["expires"] > now:
+                return self.response(request, meta, body)
+
+            headers = httpx.Headers(meta["headers"])
+
+            if etag := headers.get("etag"):
+                request.headers["If-None-Match"] = etag
+
+            if modified := headers.get("last-modified"):
+                request.headers["If-Modified-Since"] = modified
+
+        response = await self.transport.handle_async_request(request)
+
+        if response.status_code == 304 and cached:
+            await response.aclose()
+
+            meta["expires"] = self.expires(response.headers, ttl, now) or now
+            meta["stored"] = now
+
+            self.store.save(url, meta, body)
+
+            return self.response(request, meta, body)
+
+        if response.status_code != 200:
+            return response
+
+        if (expires := self.expires(response.headers, ttl, now)) is None:
+            return response
+
+        await response.aread()
+
+        meta = {
+            "status": response.status_code,
+            "headers": [
+                (k, v)
+                for k, v in response.headers.items()
+                if k.lower() not in self.DROP_HEADERS
+            ],
+            "stored": now,
+            "expires": expires,
+        }
+
+        self.store.save(url, meta, response.content)
+
+        return self.response(request, meta, response.content, from_cache=False)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = ["CachingTransport", "HTTPCache"]
@@ -0,0 +1,101 @@
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+
+class LatencyTracker:
+    def __init__(
+        self,
+        file: Path | None = None,
+        size: int = 200,
+        min_samples: int = 10,
+        exp: int | float = 604_800,
+    ) -> None:
+
+        self.file = file
+        self.size = size
+        self.min_samples = min_samples
+        self.exp = exp
+
+        self.recorded: dict[str, list[float]] = {}
+
+        self.load()
+
+    def load(self) -> None:
+        self.samples: dict[str, deque[float]] = {
+            key: deque(entry["samples"], maxlen=self.size)
+            for key, entry in self._read().items()
+        }
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        if not self.file:
+            return {}
+
+        try:
+            data: dict = json.loads(self.file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        now = time.time()
+
+        return {k: v for k, v in data.items() if now - v["timestamp"] < self.exp}
+
+    def record(self, key: str, latency: float) -> None:
+        if not (samples := self.samples.get(key)):
+            samples = self.samples[key] = deque(maxlen=self.size)
+
+        samples.append(latency)
+
+        self.recorded.setdefault(key, []).append(round(latency, 3))
+
+    def percentile(self, key: str, q: int | float) -> float | None:
+        if len(samples := self.samples.get(key, ())) < self.min_samples:
+            return None
+
+        ordered = sorted(samples)
+
+        return ordered[min(int(len(ordered) * q / 100), len(ordered) - 1)]
+
+    def timeout(
+        self,
+        key: str,
+        default: int | float,
+        minimum: int | float,
+        maximum: int | float,
+        q: int | float = 99,
+        factor: int | float = 1.5,
+    ) -> float:
+
+        if (p := self.percentile(key, q)) is None:
+            return default
+
+        return round(min(max(p * factor, minimum), maximum), 2)
+
+    def merge(self, recorded: dict[str, list[float]]) -> None:
+        for key, latencies in recorded.items():
+            for latency in latencies:
+                self.record(key, latency)
+
+    def save(self) -> None:
+        if not self.file or not self.recorded:
+            return
+
+        data = self._read()
+
+        now = time.time()
+
+        for key, recorded in self.recorded.items():
+            samples = data.get(key, {}).get("samples", []) + recorded
+
+            data[key] = {"samples": samples[-self.size :], "timestamp": now}
+
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        self.file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+        self.recorded.clear()
+
+
+__all__ = ["LatencyTracker"]
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: int | float, burst: int | float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+
+            if (wait := (1 - self.tokens) / self.rate) > 0:
+                await asyncio.sleep(wait)
+
+                self._refill()
+
+            self.tokens -= 1
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: int | float = 20,
+        burst: int | float = 40,
+        domains: dict[str, tuple[int | float, int | float]] | None = None,
+    ) -> None:
+
+        self.rate = rate
+        self.burst = burst
+        self.domains = dict(domains or {})
+
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def configure(
+        self,
+        domain: str,
+        rate: int | float,
+        burst: int | float | None = None,
+    ) -> None:
+
+        self.domains[domain] = (rate, burst or rate)
+
+        self._buckets.pop(domain, None)
+
+    def _match(self, host: str) -> str | None:
+        for domain in self.domains:
+            if host == domain or host.endswith(f".{domain}"):
+                return domain
+
+    def bucket(self, host: str) -> TokenBucket:
+        key = self._match(host) or host
+
+        if not (bucket := self._buckets.get(key)):
+            rate, burst = self.domains.get(key, (self.rate, self.burst))
+
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+
+        return bucket
+
+    async def acquire(self, host: str) -> None:
+        await self.bucket(host).acquire()
+
+
+__all__ = ["RateLimiter", "TokenBucket"]
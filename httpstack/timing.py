@@ -0,0 +1,164 @@
+import json
+import statistics
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .logger import get_logger
+from .transport import ReleasingStream
+
+
+class RequestTimer:
+    PHASES = {
+        "connect_tcp": "connect",
+        "start_tls": "tls",
+        "send_request_headers": "send",
+        "send_request_body": "send",
+        "receive_response_headers": "wait",
+        "receive_response_body": "body",
+    }
+
+    def __init__(self, file: Path | None = None, limit: int = 10_000) -> None:
+        self.file = file
+
+        self.records: deque[dict[str, Any]] = deque(maxlen=limit)
+
+        self._current: ContextVar[dict[str, Any] | None] = ContextVar(
+            "request_timing",
+            default=None,
+        )
+
+        self._logger = get_logger("timing")
+
+    @property
+    def hooks(self) -> dict[str, list]:
+        return {"request": [self.on_request], "response": [self.on_response]}
+
+    def dns(self, seconds: float) -> None:
+        if (record := self._current.get()) and "start" in record:
+            record["phases"]["dns"] = record["phases"].get("dns", 0) + seconds
+
+    async def _trace(
+        self,
+        record: dict[str, Any],
+        started: dict[str, float],
+        event: str,
+        info: dict[str, Any],
+    ) -> None:
+
+        *_, step, state = event.split(".")
+
+        if not (phase := self.PHASES.get(step)):
+            return
+
+        if state == "started":
+            started[step] = time.perf_counter()
+
+        elif (start := started.pop(step, None)) is not None:
+            record["phases"][phase] = (
+                record["phases"].get(phase, 0) + time.perf_counter() - start
+            )
+
+    async def on_request(self, request: httpx.Request) -> None:
+        record = {
+            "method": request.method,
+            "host": request.url.host,
+            "url": str(request.url),
+            "start": time.perf_counter(),
+            "phases": {},
+        }
+
+        self._current.set(record)
+
+        request.extensions["trace"] = partial(self._trace, record, {})
+
+    async def on_response(self, response: httpx.Response) -> None:
+        if (record := self._current.get()) is None:
+            return
+
+        record["status"] = response.status_code
+
+        for flag in ("from_cache", "coalesced"):
+            if response.extensions.get(flag):
+                record[flag] = True
+
+        if response.is_closed:
+            record["bytes"] = len(response.content)
+
+            self._finish(record, response)
+        else:
+            response.stream = ReleasingStream(
+                response.stream,
+                partial(self._finish, record, response),
+            )
+
+    def _finish(self, record: dict[str, Any], response: httpx.Response) -> None:
+        phases = record["phases"]
+
+        if "connect" in phases and "dns" in phases:
+            phases["connect"] = max(phases["connect"] - phases["dns"], 0)
+
+        record.setdefault("bytes", response.num_bytes_downloaded)
+        record["total"] = round(time.perf_counter() - record.pop("start"), 4)
+        record["phases"] = {k: round(v, 4) for k, v in phases.items()}
+
+        self.records.append(record)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        by_host: dict[str, list[dict[str, Any]]] = defaultdict(list)
+
+        for record in self.records:
+            by_host[record["host"]].append(record)
+
+        hosts = {}
+
+        for host, records in by_host.items():
+            totals = sorted(r["total"] for r in records)
+
+            hosts[host] = {
+                "count": len(records),
+                "p50": round(statistics.median(totals), 3),
+                "p95": round(totals[min(int(len(totals) * 0.95), len(totals) - 1)], 3),
+                "max": round(totals[-1], 3),
+                "bytes": sum(r["bytes"] for r in records),
+            }
+
+        return dict(sorted(hosts.items(), key=lambda item: -item[1]["p95"]))
+
+    def log_summary(self, limit: int = 10) -> None:
+        if not (hosts := self.summary()):
+            return
+
+        self._logger.info(
+            f"Timed {len(self.records)} request(s) to {len(hosts)} host(s)"
+        )
+
+        for host, stats in list(hosts.items())[:limit]:
+            self._logger.info(
+                f"{host}: {stats['count']} req, p50 {stats['p50']}s, "
+                f"p95 {stats['p95']}s, max {stats['max']}s, {stats['bytes']:,} bytes"
+            )
+
+    def save(self) -> None:
+        if self.file:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+
+            self.file.write_text(
+                json.dumps(
+                    {"hosts": self.summary(), "requests": list(self.records)},
+                    indent=2,
+                ),
+                encoding="utf-8",
+            )
+
+            self._logger.info(f"Request timings saved to {self.file.resolve()}")
+
+        self.records.clear()
+
+
+__all__ = ["RequestTimer"]
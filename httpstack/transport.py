@@ -0,0 +1,300 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import httpx
+
+from .adaptive import AdaptiveLimit
+from .breaker import CircuitBreaker
+from .latency import LatencyTracker
+from .logger import get_logger
+from .ratelimit import RateLimiter
+
+
+class ReleasingStream(httpx.AsyncByteStream):
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        release: Callable[[], None],
+    ) -> None:
+
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class HostTransport(httpx.AsyncBaseTransport):
+    RETRY_ON = (
+        httpx.ConnectError,
+        httpx.ConnectTimeout,
+        httpx.ReadError,
+        httpx.RemoteProtocolError,
+        httpx.WriteError,
+    )
+
+    RETRY_STATUS = {502, 503, 504}
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        retries: int = 2,
+        backoff: int | float = 0.5,
+        limit: int = 6,
+        breaker: CircuitBreaker | None = None,
+        limiter: RateLimiter | None = None,
+        latency: LatencyTracker | None = None,
+    ) -> None:
+
+        self.transport = transport
+        self.breaker = breaker
+        self.limiter = limiter
+        self.latency = latency
+        self.retries = retries
+        self.backoff = backoff
+        self.limit = limit
+
+        self.classes: dict[str, dict[str, Any]] = {
+            "api": {
+                "timeout": httpx.Timeout(10, connect=5),
+                "bounds": (3, 20),
+                "limit": 8,
+            },
+            "page": {
+                "timeout": httpx.Timeout(15, connect=5),
+                "bounds": (5, 30),
+                "limit": 4,
+            },
+            "archive": {"timeout": httpx.Timeout(60, connect=10), "limit": 4},
+        }
+
+        self.slots: dict[tuple[str, str | None], AdaptiveLimit] = {}
+
+        self._logger = get_logger("transport")
+
+    def slot(self, host: str, host_class: str | None) -> AdaptiveLimit:
+        if not (slot := self.slots.get((host, host_class))):
+            limit = self.classes.get(host_class, {}).get("limit", self.limit)
+
+            slot = self.slots[host, host_class] = AdaptiveLimit(limit, maximum=32)
+
+        return slot
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff * 2**attempt)
+
+    async def _send(
+        self,
+        request: httpx.Request,
+        slot: AdaptiveLimit,
+    ) -> httpx.Response:
+
+        if self.limiter:
+            await self.limiter.acquire(request.url.host)
+
+        await slot.acquire()
+
+        start = time.perf_counter()
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            slot.release(overloaded=True)
+            raise
+        except asyncio.CancelledError:
+            slot.discard()
+            raise
+        except BaseException:
+            slot.release(ok=False)
+            raise
+
+        latency = time.perf_counter() - start
+
+        if self.latency:
+            self.latency.record(request.url.host, latency)
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+
+            if not released:
+                released = True
+
+                slot.release(
+                    latency,
+                    ok=response.status_code < 500,
+                    overloaded=response.status_code in (403, 429),
+                )
+
+        response.stream = ReleasingStream(response.stream, release)
+
+        return response
+
+    async def _retry(
+        self,
+        request: httpx.Request,
+        slot: AdaptiveLimit,
+        retries: int,
+    ) -> httpx.Response:
+
+        for attempt in range(retries + 1):
+            try:
+                response = await self._send(request, slot)
+            except self.RETRY_ON as e:
+                if attempt == retries:
+                    raise
+
+                self._logger.debug(f"Retrying {request.url} after {e!r}")
+
+            else:
+                if response.status_code not in self.RETRY_STATUS or attempt == retries:
+                    return response
+
+                await response.aclose()
+
+                self._logger.debug(
+                    f"Retrying {request.url} after HTTP {response.status_code}"
+                )
+
+            await asyncio.sleep(self.delay(attempt))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host, host_class = request.url.host, request.extensions.get("host_class")
+
+        breaker = self.breaker if request.extensions.get("breaker", True) else None
+
+        if breaker and not breaker.allow(host):
+            raise httpx.ConnectError(f"Circuit open for {host}", request=request)
+
+        if timeout := (settings := self.classes.get(host_class, {})).get("timeout"):
+            request.extensions["timeout"] = timeout.as_dict()
+
+            if self.latency and (bounds := settings.get("bounds")):
+                request.extensions["timeout"]["read"] = self.latency.timeout(
+                    host,
+                    timeout.read,
+                    *bounds,
+                )
+
+        retries = (
+            request.extensions.get("retries", self.retries)
+            if request.method in ("GET", "HEAD")
+            else 0
+        )
+
+        try:
+            response = await self._retry(request, self.slot(host, host_class), retries)
+        except httpx.TransportError:
+            if breaker:
+                breaker.failure(host)
+
+            raise
+
+        except BaseException:
+            if breaker:
+                breaker.probing.discard(host)
+
+            raise
+
+        if breaker:
+            if response.status_code >= 500:
+                breaker.failure(host)
+            else:
+                breaker.success(host)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class CoalescingTransport(httpx.AsyncBaseTransport):
+    DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+    OPTIONS = ("breaker", "cache", "host_class", "retries", "timeout")
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport = transport
+
+        self.stats: Counter[str] = Counter()
+
+        self._pending: dict[tuple, asyncio.Future] = {}
+
+    async def _fetch(self, request: httpx.Request) -> tuple[int, list, bytes, dict]:
+        response = await self.transport.handle_async_request(request)
+
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in self.DROP_HEADERS
+        ]
+
+        extensions = {
+            k: v
+            for k, v in response.extensions.items()
+            if k in ("http_version", "reason_phrase", "from_cache")
+        }
+
+        return response.status_code, headers, response.content, extensions
+
+    def key(self, request: httpx.Request) -> tuple:
+        options = tuple(
+            (name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+            for name in self.OPTIONS
+            if (value := request.extensions.get(name)) is not None
+        )
+
+        return str(request.url), tuple(sorted(request.headers.multi_items())), options
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or not request.extensions.get("coalesce", True):
+            return await self.transport.handle_async_request(request)
+
+        key = self.key(request)
+
+        self.stats["requests"] += 1
+
+        if joined := key in self._pending:
+            self.stats["coalesced"] += 1
+
+            pending = self._pending[key]
+        else:
+            pending = self._pending[key] = asyncio.ensure_future(self._fetch(request))
+
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+
+        status, headers, body, extensions = await asyncio.shield(pending)
+
+        if joined:
+            extensions = {**extensions, "coalesced": True}
+
+        return httpx.Response(
+            status,
+            headers=headers,
+            content=body,
+            request=request,
+            extensions=extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+__all__ = ["CoalescingTransport", "HostTransport"]
@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+from scrapers.utils.browsers import BrowserPool
+from scrapers.utils.routing import RoutePolicy
+
+
+class StandInPage:
+    def __init__(self) -> None:
+        self.routes = []
+
+    async def route(self, pattern: str, handler) -> None:
+        self.routes.append(handler)
+
+
+class StandInContext:
+    def __init__(self) -> None:
+        self.browser = SimpleNamespace(is_connected=lambda: True)
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern: str, handler) -> None:
+        self.routes.append(handler)
+
+    async def new_page(self) -> StandInPage:
+        return StandInPage()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_brave_leases_route_their_own_pages():
+    async def main() -> None:
+        shared = StandInContext()
+
+        pool = BrowserPool()
+
+        async def new_context(kind: str, ignore_https_errors: bool = False):
+            return shared
+
+        pool.new_context = new_context
+
+        strict, relaxed = RoutePolicy(), RoutePolicy(resource_types=())
+
+        first = pool.checkout("brave", block=strict)
+        second = pool.checkout("brave", block=relaxed)
+
+        strict_page = await (await first.context()).new_page()
+        relaxed_page = await (await second.context()).new_page()
+
+        await first.release()
+
+        assert shared.routes == []
+        assert not shared.closed
+        assert strict_page.routes == [strict.handle]
+        assert relaxed_page.routes == [relaxed.handle]
+
+    asyncio.run(main())
+
+
+def test_other_leases_route_and_close_their_context():
+    async def main() -> None:
+        pool = BrowserPool()
+
+        contexts = []
+
+        async def new_context(kind: str, ignore_https_errors: bool = False):
+            contexts.append(StandInContext())
+            return contexts[-1]
+
+        pool.new_context = new_context
+
+        policy = RoutePolicy()
+
+        async with pool.lease("firefox", block=policy) as lease:
+            await lease.context()
+
+        assert contexts[0].routes == [policy.handle]
+        assert contexts[0].closed
+
+    asyncio.run(main())
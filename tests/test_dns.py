@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+
+from httpstack import HTTPStack
+from httpstack.dns import CachingBackend, DNSCache, install
+
+
+async def local_server() -> tuple[asyncio.Server, int]:
+    async def respond(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok"
+        )
+
+        await writer.drain()
+
+        writer.close()
+
+    server = await asyncio.start_server(respond, "127.0.0.1", 0)
+
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_requests_resolve_through_the_dns_cache():
+    async def main() -> None:
+        server, port = await local_server()
+
+        network = HTTPStack()
+
+        try:
+            for _ in range(2):
+                r = await network.client.get(
+                    f"http://localhost:{port}/",
+                    extensions={"coalesce": False},
+                )
+
+                assert r.text == "ok"
+
+            assert network.dns.stats["lookups"] == 1
+            assert network.dns.stats["hits"] == 1
+        finally:
+            await network.client.aclose()
+
+            server.close()
+
+            await server.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_install_rejects_unknown_transports():
+    backend = CachingBackend(DNSCache())
+
+    assert install(httpx.AsyncHTTPTransport(), backend)
+    assert not install(httpx.MockTransport(lambda request: None), backend)
@@ -0,0 +1,14 @@
+from scrapers.utils.history import History
+
+
+def test_streak_counts_runs_without_new_events(tmp_path):
+    history = History(tmp_path / "history.json", grace=1, base=60)
+
+    for ts in (100, 200, 300):
+        history.record("stale", {"ts": ts, "new": 0, "total": 12})
+
+    history.record("fresh", {"ts": 300, "new": 3, "total": 12})
+
+    assert history.data["stale"]["streak"] == 3
+    assert history.next_due("stale") == 300 + 60 * 2**2
+    assert history.next_due("fresh") == 0
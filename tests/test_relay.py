@@ -0,0 +1,237 @@
+import asyncio
+import importlib
+
+import pytest
+
+from scrapers.utils.relay import Relay
+from scrapers.utils.server import Request, Response, Server
+from scrapers.utils.webwork import Network
+
+MASTER = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000
+low/index.m3u8
+"""
+
+VARIANT = (
+    '#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXT-X-KEY:METHOD=AES-128,URI="key.bin"\n'
+    + "".join(f"#EXTINF:4.0,\nseg{i}.ts\n" for i in range(5))
+    + "#EXTINF:4.0,\nhttps://cdn.other.test/seg5\n"
+)
+
+
+class HLSFixture:
+    def __init__(self) -> None:
+        self.server = Server()
+        self.requests: list[Request] = []
+        self.origin = ""
+
+        self.server.route("/", self.handle)
+
+    async def handle(self, request: Request) -> Response:
+        self.requests.append(request)
+
+        if request.path == "/live/master.m3u8":
+            return Response(200, MASTER.encode())
+
+        if request.path == "/live/low/index.m3u8":
+            return Response(200, VARIANT.encode())
+
+        if request.path.startswith("/live/low/seg"):
+            await asyncio.sleep(0.1)
+
+            return Response(200, b"\x47" * 188, {"Content-Type": "video/mp2t"})
+
+        return Response.error(404)
+
+    def hits(self, path: str) -> int:
+        return sum(1 for r in self.requests if r.path == path)
+
+    async def __aenter__(self) -> "HLSFixture":
+        await self.server.start("127.0.0.1", 0)
+
+        port = self.server._server.sockets[0].getsockname()[1]
+
+        self.origin = f"http://127.0.0.1:{port}"
+
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.server.close()
+
+
+@pytest.fixture(autouse=True)
+def network(monkeypatch):
+    fresh = Network()
+
+    monkeypatch.setattr(importlib.import_module(Relay.__module__), "network", fresh)
+
+    return fresh
+
+
+def make_relay(**kwargs) -> Relay:
+    relay = Relay(**kwargs)
+
+    relay.enabled, relay.base_url = True, "http://relay.local"
+
+    return relay
+
+
+async def get(relay: Relay, url: str) -> Response:
+    return await relay.handle(Request("GET", url.removeprefix(relay.base_url), {}))
+
+
+def uris(playlist: bytes) -> list[str]:
+    return [line for line in playlist.decode().splitlines() if not line.startswith("#")]
+
+
+def test_rewrites_playlists_to_relay_urls():
+    async def main() -> None:
+        async with HLSFixture() as hls:
+            relay = make_relay()
+
+            entry = relay.add(
+                "[NBA] A vs B",
+                {
+                    "url": f"{hls.origin}/live/master.m3u8",
+                    "base": "https://embed.test/",
+                },
+            )
+
+            master = await get(relay, entry["url"])
+
+            assert master.status == 200
+            assert master.headers["Content-Type"] == "application/vnd.apple.mpegurl"
+
+            [variant_url] = uris(master.body)
+
+            assert variant_url.startswith("http://relay.local/relay/")
+            assert variant_url.endswith(".m3u8")
+
+            variant = (await get(relay, variant_url)).body
+
+            assert b"127.0.0.1" not in variant
+            assert b"cdn.other.test" not in variant
+            assert b'URI="http://relay.local/relay/' in variant
+
+            segments = uris(variant)
+
+            assert len(segments) == 6
+            assert all(url.endswith(".ts") for url in segments)
+
+    asyncio.run(main())
+
+
+def test_injects_referer_origin_and_user_agent(network):
+    async def main() -> None:
+        async with HLSFixture() as hls:
+            relay = make_relay()
+
+            entry = relay.add(
+                "[NBA] A vs B",
+                {
+                    "url": f"{hls.origin}/live/low/index.m3u8",
+                    "base": "https://embed.test/",
+                },
+            )
+
+            await get(relay, entry["url"])
+
+            headers = hls.requests[-1].headers
+
+            assert headers["referer"] == "https://embed.test/"
+            assert headers["origin"] == "https://embed.test"
+            assert headers["user-agent"] == network.UA
+
+    asyncio.run(main())
+
+
+def test_concurrent_segment_requests_share_one_upstream_fetch():
+    async def main() -> None:
+        async with HLSFixture() as hls:
+            relay = make_relay()
+
+            entry = relay.add(
+                "[NBA] A vs B",
+                {"url": f"{hls.origin}/live/low/index.m3u8", "base": ""},
+            )
+
+            segment = uris((await get(relay, entry["url"])).body)[0]
+
+            responses = await asyncio.gather(*(get(relay, segment) for _ in range(5)))
+
+            assert all(r.status == 200 and len(r.body) == 188 for r in responses)
+            assert responses[0].headers["Content-Type"] == "video/mp2t"
+
+            await get(relay, segment)
+
+            assert hls.hits("/live/low/seg0.ts") == 1
+            assert relay.misses == 1
+            assert relay.hits == 5
+
+    asyncio.run(main())
+
+
+def test_segment_cache_evicts_least_recently_used():
+    async def main() -> None:
+        async with HLSFixture() as hls:
+            relay = make_relay(max_bytes=188 * 4)
+
+            entry = relay.add(
+                "[NBA] A vs B",
+                {"url": f"{hls.origin}/live/low/index.m3u8", "base": ""},
+            )
+
+            segments = uris((await get(relay, entry["url"])).body)[:5]
+
+            for segment in segments:
+                assert (await get(relay, segment)).status == 200
+
+            assert relay._size == 188 * 4
+
+            await get(relay, segments[0])
+
+            assert hls.hits("/live/low/seg0.ts") == 2
+            assert hls.hits("/live/low/seg4.ts") == 1
+
+    asyncio.run(main())
+
+
+def test_upstream_errors_become_bad_gateway():
+    async def main() -> None:
+        async with HLSFixture() as hls:
+            relay = make_relay()
+
+            missing = relay.add(
+                "[NBA] C vs D",
+                {"url": f"{hls.origin}/live/gone.m3u8", "base": ""},
+            )
+
+            assert (await get(relay, missing["url"])).status == 502
+
+            entry = relay.add(
+                "[NBA] A vs B",
+                {"url": f"{hls.origin}/live/low/index.m3u8", "base": ""},
+            )
+
+            variant = (await get(relay, entry["url"])).body.decode()
+
+            key = variant.split('URI="', 1)[1].split('"', 1)[0]
+
+            assert (await get(relay, key)).status == 502
+
+    asyncio.run(main())
+
+
+def test_unknown_resources_are_not_found():
+    async def main() -> None:
+        relay = make_relay()
+
+        assert (await get(relay, "/relay/nope.m3u8")).status == 404
+
+        entry = relay.add("[NBA] A vs B", {"url": "http://x.test/a.m3u8", "base": ""})
+
+        token = entry["url"].rsplit("/", 1)[1].removesuffix(".m3u8")
+
+        assert (await get(relay, f"/relay/{token}/0000.ts")).status == 404
+
+    asyncio.run(main())
@@ -0,0 +1,364 @@
+import asyncio
+import re
+import time
+from functools import partial
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from httpstack.transport import HostTransport
+
+from scrapers.utils import browsers, get_logger, network
+from scrapers.utils.resolver import Resolver
+from scrapers.utils.server import Request, Response, Server
+
+log = get_logger("test_resolver")
+
+STREAM = "https://cdn.example.com/live/event-1/index.m3u8"
+
+PAGES = {
+    "/event/1": f'<html><script src="/player.js"></script><video src="{STREAM}"></video></html>',
+    "/event/empty": '<html><script src="/player.js"></script></html>',
+}
+
+
+class StandInPage:
+    def __init__(self, context: "StandInContext") -> None:
+        self.context = context
+        self.listeners = []
+
+    def on(self, event: str, handler) -> None:
+        self.listeners.append(handler)
+
+    def remove_listener(self, event: str, handler) -> None:
+        self.listeners.remove(handler)
+
+    async def goto(self, url: str, **kwargs) -> None:
+        async with httpx.AsyncClient() as client:
+            r = await client.get(url)
+
+        for src in re.findall(r'src="([^"]+)"', r.text):
+            for handler in self.listeners:
+                handler(SimpleNamespace(url=src))
+
+    async def close(self) -> None:
+        self.context.closed += 1
+
+
+class StandInContext:
+    def __init__(self) -> None:
+        self.opened = 0
+        self.closed = 0
+
+    async def new_page(self) -> StandInPage:
+        self.opened += 1
+
+        await asyncio.sleep(0.05)
+
+        return StandInPage(self)
+
+
+class StandInLease:
+    def __init__(self, context: StandInContext) -> None:
+        self._context = context
+
+    async def context(self) -> StandInContext:
+        return self._context
+
+    async def release(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def isolate(monkeypatch):
+    context = StandInContext()
+
+    monkeypatch.setattr(
+        browsers,
+        "checkout",
+        lambda *args, **kwargs: StandInLease(context),
+    )
+
+    network.breaker.failures.clear()
+    network.breaker.opened.clear()
+    network.pools.pop("resolver", None)
+
+    yield context
+
+    network.pools.pop("resolver", None)
+
+
+async def stand_in_site() -> tuple[Server, str]:
+    site = Server()
+
+    async def page(request: Request) -> Response:
+        if body := PAGES.get(request.path):
+            return Response(200, body.encode(), {"Content-Type": "text/html"})
+
+        return Response.error(404)
+
+    site.route("/", page)
+
+    await site.start("127.0.0.1", 0)
+
+    port = site._server.sockets[0].getsockname()[1]
+
+    return site, f"http://127.0.0.1:{port}"
+
+
+def make_resolver() -> Resolver:
+    resolver = Resolver(timeout=5)
+
+    resolver.enabled, resolver.base_url = True, "http://play.local"
+
+    return resolver
+
+
+def handler(url: str):
+    return partial(network.process_event, url=url, url_num=1, timeout=1, log=log)
+
+
+def play(resolver: Resolver, entry: dict) -> Request:
+    return Request("GET", entry["url"].removeprefix(resolver.base_url), {})
+
+
+def test_play_redirects_to_stream_captured_by_browser(isolate):
+    async def main() -> None:
+        site, origin = await stand_in_site()
+
+        resolver = make_resolver()
+
+        try:
+            entry = resolver.add(
+                "[Soccer] A vs B",
+                {"logo": ""},
+                handler(f"{origin}/event/1"),
+                browser="firefox",
+            )
+
+            assert entry["url"].startswith(f"http://play.local{Resolver.PREFIX}")
+
+            response = await resolver.handle(play(resolver, entry))
+
+            assert response.status == 302
+            assert response.headers["Location"] == STREAM
+            assert isolate.opened == isolate.closed == 1
+        finally:
+            await site.close()
+
+    asyncio.run(main())
+
+
+def test_concurrent_viewers_share_one_extraction(isolate):
+    async def main() -> None:
+        site, origin = await stand_in_site()
+
+        resolver = make_resolver()
+
+        try:
+            entry = resolver.add(
+                "[Soccer] A vs B",
+                {},
+                handler(f"{origin}/event/1"),
+                browser="firefox",
+            )
+
+            responses = await asyncio.gather(
+                *(resolver.handle(play(resolver, entry)) for _ in range(5))
+            )
+
+            assert {r.headers["Location"] for r in responses} == {STREAM}
+
+            await resolver.handle(play(resolver, entry))
+
+            assert isolate.opened == 1
+        finally:
+            await site.close()
+
+    asyncio.run(main())
+
+
+def test_missing_stream_returns_bad_gateway(isolate):
+    async def main() -> None:
+        site, origin = await stand_in_site()
+
+        resolver = make_resolver()
+
+        try:
+            entry = resolver.add(
+                "[Soccer] C vs D",
+                {},
+                handler(f"{origin}/event/empty"),
+                browser="firefox",
+            )
+
+            response = await resolver.handle(play(resolver, entry))
+
+            assert response.status == 502
+            assert isolate.closed == 1
+        finally:
+            await site.close()
+
+    asyncio.run(main())
+
+
+def test_failed_jobs_release_their_resolver_slot(isolate):
+    async def main() -> None:
+        site, origin = await stand_in_site()
+
+        resolver = make_resolver()
+
+        try:
+            for i in range(2):
+                broken = resolver.add(f"broken {i}", {}, handler(f"{origin}/event/1"))
+
+                response = await resolver.handle(play(resolver, broken))
+
+                assert response.status == 502
+
+            entry = resolver.add(
+                "[Soccer] A vs B",
+                {},
+                handler(f"{origin}/event/1"),
+                browser="firefox",
+            )
+
+            response = await resolver.handle(play(resolver, entry))
+
+            assert response.status == 302
+            assert network.pools["resolver"].inflight == 0
+        finally:
+            await site.close()
+
+    asyncio.run(main())
+
+
+def test_browser_launch_failure_is_a_bad_gateway(monkeypatch):
+    class BrokenLease(StandInLease):
+        async def context(self) -> StandInContext:
+            raise RuntimeError("browser failed to launch")
+
+    monkeypatch.setattr(browsers, "checkout", lambda *args: BrokenLease(None))
+
+    resolver = make_resolver()
+
+    entry = resolver.add(
+        "[Soccer] A vs B",
+        {},
+        handler("http://x.test/event/1"),
+        browser="firefox",
+    )
+
+    response = asyncio.run(resolver.handle(play(resolver, entry)))
+
+    assert response.status == 502
+    assert network.pools["resolver"].inflight == 0
+
+
+def test_unknown_token_is_not_found():
+    response = asyncio.run(
+        make_resolver().handle(Request("GET", f"{Resolver.PREFIX}missing", {}))
+    )
+
+    assert response.status == 404
+
+
+def test_restore_reregisters_deferred_entries():
+    resolver = make_resolver()
+
+    def defer(key: str, entry: dict, url_num: int) -> dict:
+        return resolver.add(key, entry, handler(entry["link"]), browser="firefox")
+
+    cached = {
+        "done": {"url": STREAM, "timestamp": 0},
+        "lazy": resolver.placeholder({"link": "http://x/event", "timestamp": 0}),
+    }
+
+    deferred = resolver.restore(cached, defer)
+
+    assert set(cached) == {"done", "lazy"}
+    assert deferred["lazy"]["url"] == f"http://play.local/play/{resolver.token('lazy')}"
+    assert resolver.token("lazy") in resolver.jobs
+
+    resolver.enabled = False
+
+    assert resolver.restore(cached, defer) == {}
+    assert set(cached) == {"done"}
+
+
+def test_failed_context_only_fails_its_event():
+    launches = []
+
+    async def context() -> StandInContext:
+        launches.append(len(launches))
+
+        if len(launches) == 1:
+            raise RuntimeError("browser failed to launch")
+
+        return StandInContext()
+
+    async def fn(url: str, url_num: int, context: StandInContext) -> str:
+        return url
+
+    events = [{"link": "http://x/event/1"}, {"link": "http://x/event/2"}]
+
+    results = asyncio.run(network.extract(events, fn, context, log, workers=1))
+
+    network.pools.pop(log.name, None)
+
+    assert results == [None, "http://x/event/2"]
+
+
+def test_events_without_a_stream_count_against_the_host():
+    async def fn(url: str, url_num: int) -> str | None:
+        return None if url.endswith("empty") else url
+
+    async def main() -> None:
+        for i in range(network.breaker.threshold):
+            await network.safe_process(
+                partial(fn, url="http://x.test/empty", url_num=i),
+                url_num=i,
+                log=log,
+            )
+
+        assert "x.test" in network.breaker.opened
+
+        url = await network.safe_process(
+            partial(fn, url="http://y.test/event", url_num=1),
+            url_num=1,
+            log=log,
+        )
+
+        assert url == "http://y.test/event"
+        assert "y.test" not in network.breaker.failures
+
+    asyncio.run(main())
+
+    network.pools.pop(log.name, None)
+
+
+def test_half_open_probe_reaches_the_host():
+    hosts = HostTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, text=str(request.url))),
+        breaker=network.breaker,
+    )
+
+    async def fn(url: str, url_num: int) -> str:
+        async with httpx.AsyncClient(transport=hosts) as client:
+            return (await client.get(url)).text
+
+    network.breaker.opened["x.test"] = time.monotonic() - network.breaker.cooldown
+
+    url = asyncio.run(
+        network.safe_process(
+            partial(fn, url="http://x.test/event", url_num=1),
+            url_num=1,
+            log=log,
+        )
+    )
+
+    network.pools.pop(log.name, None)
+
+    assert url == "http://x.test/event"
+    assert "x.test" not in network.breaker.opened
+    assert not network.breaker.probing
@@ -0,0 +1,15 @@
+from scrapers.utils import Scheduler, Time
+
+
+def test_events_inside_the_last_window_are_not_rerun(tmp_path):
+    schedule = Scheduler(tmp_path / "schedule.json", lead=300, window=1_800)
+
+    last = Time.clean(Time.now()).timestamp()
+
+    schedule.mark(last)
+
+    collected, next_up, same_batch = last + 1_200, last + 2_400, last + 3_600
+
+    batches = schedule.batches([collected, next_up, same_batch], now=last + 60)
+
+    assert batches == [(next_up - 300, [next_up, same_batch])]
@@ -0,0 +1,41 @@
+import asyncio
+import gzip
+
+from scrapers.utils.server import Request, Server
+
+
+def test_watch_file_waits_for_the_file_to_settle(tmp_path):
+    file = tmp_path / "epg.xml"
+
+    async def main() -> None:
+        server = Server()
+
+        task = asyncio.create_task(
+            server.watch_file("/epg.xml", file, "application/xml", 0.01, 0.1)
+        )
+
+        try:
+            file.write_bytes(b"<tv>")
+
+            await asyncio.sleep(0.05)
+
+            with file.open("ab") as f:
+                f.write(b"</tv>")
+
+            await asyncio.sleep(0.05)
+
+            assert "/epg.xml" not in server.assets
+
+            await asyncio.sleep(0.3)
+
+            response = server.assets["/epg.xml"].respond(
+                Request("GET", "/epg.xml", {"accept-encoding": "gzip"})
+            )
+
+            assert gzip.decompress(response.body) == b"<tv></tv>"
+        finally:
+            task.cancel()
+
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+from scrapers.utils import network, run_shards
+
+PROVIDER = """
+from pathlib import Path
+
+from scrapers.utils import Cache, network
+
+CACHE_FILE = Cache(Path(__file__).parent / "cache.json", exp=10_800)
+
+urls = {}
+
+
+async def scrape(client):
+    network.mirrors.record("https://mirror.test", 0.25)
+    network.latency.record("mirror.test", 0.25)
+
+    urls["A vs B"] = {"url": "https://mirror.test/a.m3u8", "timestamp": 0}
+"""
+
+
+def test_workers_hand_observations_to_the_parent(tmp_path, monkeypatch):
+    (tmp_path / "stand_in_shard.py").write_text(PROVIDER, encoding="utf-8")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(network.mirrors, "data", {})
+    monkeypatch.setattr(network.mirrors, "recorded", set())
+    monkeypatch.setattr(network.latency, "recorded", {})
+
+    files = [network.mirrors.cache.file, network.latency.file]
+
+    def mtimes() -> list[int | None]:
+        return [f.stat().st_mtime_ns if f.exists() else None for f in files]
+
+    before = mtimes()
+
+    results = run_shards([["stand_in_shard"]], timeout=60)
+
+    assert results["stand_in_shard"]["urls"]["A vs B"]["url"].endswith("a.m3u8")
+    assert network.mirrors.observations()["https://mirror.test"]["latency"] == 0.25
+    assert network.latency.recorded == {"mirror.test": [0.25]}
+    assert mtimes() == before
+
+    network.latency.samples.pop("mirror.test", None)
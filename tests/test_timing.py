@@ -0,0 +1,24 @@
+import asyncio
+
+import httpx
+
+from httpstack.timing import RequestTimer
+
+
+def test_records_are_bounded():
+    async def main() -> None:
+        timer = RequestTimer(limit=3)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+            event_hooks=timer.hooks,
+        ) as client:
+            for i in range(5):
+                await client.get(f"https://api.test/{i}")
+
+        assert [r["url"] for r in timer.records] == [
+            f"https://api.test/{i}" for i in (2, 3, 4)
+        ]
+        assert timer.summary()["api.test"]["count"] == 3
+
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+
+from httpstack.transport import CoalescingTransport, HostTransport
+
+
+def make_client() -> tuple[httpx.AsyncClient, list[httpx.Request]]:
+    seen: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+
+        await asyncio.sleep(0.05)
+
+        return httpx.Response(200, content=b"ok")
+
+    transport = CoalescingTransport(httpx.MockTransport(handler))
+
+    return httpx.AsyncClient(transport=transport), seen
+
+
+def test_identical_gets_share_one_request():
+    async def main() -> None:
+        client, seen = make_client()
+
+        async with client:
+            responses = await asyncio.gather(
+                *(client.get("https://api.test/a") for _ in range(3))
+            )
+
+        assert [r.text for r in responses] == ["ok"] * 3
+        assert len(seen) == 1
+        assert sum(bool(r.extensions.get("coalesced")) for r in responses) == 2
+
+    asyncio.run(main())
+
+
+def test_different_timeouts_and_options_are_not_joined():
+    async def main() -> None:
+        client, seen = make_client()
+
+        async with client:
+            await asyncio.gather(
+                client.get("https://api.test/a"),
+                client.get("https://api.test/a", timeout=30),
+                client.get("https://api.test/a", extensions={"breaker": False}),
+                client.get("https://api.test/a", extensions={"host_class": "page"}),
+                client.get("https://api.test/a", extensions={"coalesce": False}),
+            )
+
+        assert len(seen) == 5
+
+    asyncio.run(main())
+
+
+def test_cancelled_requests_leave_the_host_limit_alone():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+
+        return httpx.Response(200)
+
+    hosts = HostTransport(httpx.MockTransport(handler), limit=2)
+
+    async def main() -> None:
+        async with httpx.AsyncClient(transport=hosts) as client:
+            for _ in range(4):
+                task = asyncio.create_task(client.get("https://api.test/a"))
+
+                await asyncio.sleep(0.01)
+
+                task.cancel()
+
+                await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+
+    slot = hosts.slots["api.test", None]
+
+    assert (slot.inflight, slot.current) == (0, 2)
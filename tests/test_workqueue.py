@@ -0,0 +1,126 @@
+import asyncio
+import json
+import sqlite3
+import sys
+
+import pytest
+
+from scrapers.utils import WorkQueue, drain, network, reduce_shards, resolver, work
+
+STREAM = "http://x.test/event/index.m3u8"
+
+PROVIDER = """
+from functools import partial
+from pathlib import Path
+
+from scrapers.utils import Cache, Time, resolver
+
+CACHE_FILE = Cache(Path(__file__).parent / "cache.json", exp=10_800)
+
+urls = {}
+
+
+async def process_event(url, url_num):
+    return f"{url}/index.m3u8"
+
+
+def defer(key, entry, url_num):
+    return resolver.add(
+        key,
+        entry,
+        partial(process_event, url=entry["link"], url_num=url_num),
+    )
+
+
+async def scrape(client):
+    cached_urls = CACHE_FILE.load()
+    deferred = resolver.restore(cached_urls, defer)
+    urls.update(cached_urls)
+    urls.update(deferred)
+
+    if "A vs B" not in cached_urls:
+        entry = {"link": "http://x.test/event", "timestamp": Time.now().timestamp()}
+
+        urls["A vs B"] = defer("A vs B", entry, 1)
+
+        cached_urls["A vs B"] = resolver.placeholder(entry)
+
+    CACHE_FILE.write(cached_urls)
+"""
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    (tmp_path / "stand_in_provider.py").write_text(PROVIDER, encoding="utf-8")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(network.latency, "file", None)
+    monkeypatch.setattr(resolver, "enabled", False)
+
+    yield "stand_in_provider"
+
+    sys.modules.pop("stand_in_provider", None)
+    resolver.jobs.clear()
+
+
+def test_resolved_events_are_written_back_to_the_provider_cache(provider, tmp_path):
+    queue = WorkQueue(tmp_path / "queue.db")
+
+    run = queue.start_run([provider])
+
+    asyncio.run(work(queue, run))
+
+    with sqlite3.connect(queue.file) as db:
+        (payload,) = db.execute(
+            "SELECT payload FROM items WHERE kind = 'event'"
+        ).fetchone()
+
+    item = json.loads(payload)
+
+    assert (item["key"], item["entry"]["link"], item["url_num"]) == (
+        "A vs B",
+        "http://x.test/event",
+        1,
+    )
+
+    cached = json.loads((tmp_path / "cache.json").read_text(encoding="utf-8"))
+
+    assert cached["A vs B"]["url"] == STREAM
+    assert not cached["A vs B"].get("lazy")
+    assert reduce_shards(queue.shard_dir(run))["A vs B"]["url"] == STREAM
+
+    queue.enqueue(run + 1, "provider", provider)
+
+    asyncio.run(work(queue, run + 1))
+
+    with sqlite3.connect(queue.file) as db:
+        kinds = db.execute(
+            "SELECT kind FROM items WHERE run = ?", (run + 1,)
+        ).fetchall()
+
+    assert kinds == [("provider",)]
+    assert reduce_shards(queue.shard_dir(run + 1))["A vs B"]["url"] == STREAM
+
+
+def test_drain_waits_for_outstanding_items(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.db", max_attempts=1)
+
+    queue.enqueue(1, "event", "stand_in_provider", b"{}")
+
+    async def main() -> None:
+        waiter = asyncio.create_task(drain(queue, 1, timeout=30))
+
+        await asyncio.sleep(0.1)
+
+        assert not waiter.done()
+
+        item_id, *_ = queue.claim(1, "worker")
+
+        queue.finish(item_id, ok=False)
+
+        await asyncio.wait_for(waiter, 5)
+
+    asyncio.run(main())
+
+    assert queue.outstanding(1) == 0
+    assert queue.failed(1) == 1